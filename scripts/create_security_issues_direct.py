@@ -5,65 +5,523 @@ scripts/create_security_issues_direct.py
 
 Create GitHub issues directly using GitHub API (no gh CLI required).
 Reads SECURITY_SCAN_REPORT.md and creates issues for each finding.
+Pacing and time limits, run state and journals, caches, the job queue and
+the scan history live in the security_issues_*.py modules next to it.
 
 Usage:
     python scripts/create_security_issues_direct.py --token YOUR_GITHUB_TOKEN
     python scripts/create_security_issues_direct.py --dry-run
+    python scripts/create_security_issues_direct.py --dry-run --report scan.md.zst
+    python scripts/create_security_issues_direct.py --report "reports/*.md" extra.md.gz
+    zcat scan.md.gz | python scripts/create_security_issues_direct.py --report -
+    python scripts/create_security_issues_direct.py --watch --watch-idle 300
+    python scripts/create_security_issues_direct.py --repo-map repos.json
+    python scripts/create_security_issues_direct.py --rules rules.json
+    python scripts/create_security_issues_direct.py --assign-owners
+    python scripts/create_security_issues_direct.py --stream --workers 8
+    python scripts/create_security_issues_direct.py --output jsonl > results.jsonl
+    python scripts/create_security_issues_direct.py --queue --workers 8
+    python scripts/create_security_issues_direct.py --plan --plan-latency 0.8
+    python scripts/create_security_issues_direct.py --dry-run --write-plan plan.ndjson
+    python scripts/create_security_issues_direct.py --apply plan.ndjson
+    python scripts/create_security_issues_direct.py --sync
+    python scripts/create_security_issues_direct.py --app-id 123 --app-private-key k.pem
+    python scripts/create_security_issues_direct.py --shard 2/4 --journal shard-2.jsonl
+    python scripts/create_security_issues_direct.py --merge-journals shard-*.jsonl
+    python scripts/create_security_issues_direct.py --trend --older-than 30
 """
 
 import argparse
+import atexit
+import base64
+import bisect
+import bz2
+import codecs
+import csv
+import ctypes
+import ctypes.util
+import gzip
+import hashlib
+import heapq
+import io
+import itertools
 import json
+import lzma
 import os
+import platform
+import queue
 import re
+import select
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Set, Tuple
+from urllib.parse import urlencode, urlparse
 import requests
 
+from security_issues_common import (
+    PLAN_FIELDS,
+    ResultOutput,
+    RuleSet,
+    SourceSnippets,
+    expand_reports,
+    finding_fingerprint,
+    fingerprint_order,
+    format_snippet,
+    get_labels,
+    iter_plan,
+    load_rules,
+    merge_sorted_runs,
+    normalize_path,
+    note_collapse,
+    sorted_run,
+)
+from security_issues_caches import SECTION_CACHE_PATH, HTTPCache, SectionCache
+from security_issues_history import HISTORY_PATH, HistoryStore, export_findings
+from security_issues_limits import (
+    ConcurrencyController,
+    Deadline,
+    RateBudget,
+    TimeBudgetExceeded,
+)
+from security_issues_queue import JOB_STATES, QUEUE_PATH, JobQueue
+from security_issues_state import (
+    STATE_DIR,
+    IssueState,
+    RunJournal,
+    merge_journals,
+    shard_of,
+)
+
 # Fix encoding for Windows console
 if sys.platform == "win32":
-    import codecs
-
     sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
     sys.stderr = codecs.getwriter("utf-8")(sys.stderr.detach())
 
 REPORT_PATH = Path("SECURITY_SCAN_REPORT.md")
-GITHUB_API = "https://api.github.com"
+REPORT_READ_CHUNK = 1 << 20
+REPORT_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+GITHUB_API = os.getenv("GITHUB_API_URL", "https://api.github.com")
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+APP_TOKEN_REFRESH_MARGIN = 300
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 30.0
+RATE_LIMIT_MAX_WAIT = 120
+FANOUT_RATE_LIMIT = 60.0
+FINGERPRINT_MARKER_RE = re.compile(r"<!-- security-finding: ([0-9a-f]{40}) -->")
+TASK_RE = re.compile(r"^- \[([ xX])\] (.+)$", re.MULTILINE)
+LABEL_COLORS = {
+    "security": "5319e7",
+    "security-critical": "b60205",
+    "security-high": "d93f0b",
+    "security-medium": "fbca04",
+    "security-low": "0e8a16",
+    "priority-p0": "b60205",
+    "priority-p1": "d93f0b",
+    "priority-p2": "fbca04",
+    "priority-p3": "0e8a16",
+}
+BLAME_CACHE_PATH = STATE_DIR / "blame-cache.json"
+BLAME_CACHE_MAX_ENTRIES = 20000
+SECTION_MAX_LINES = 2000
+SEVERITY_PRIORITY = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+CODEOWNERS_PATHS = [".github/CODEOWNERS", "CODEOWNERS", "docs/CODEOWNERS"]
+NOREPLY_EMAIL_RE = re.compile(
+    r"^(?:\d+\+)?([A-Za-z0-9-]+)@users\.noreply\.github\.com$"
+)
+BLAME_HEADER_RE = re.compile(r"^[0-9a-f]{40} \d+ \d+ \d+$")
+FILE_PATH_RE = re.compile(
+    r"([^\s|]+\.(ts|tsx|js|jsx|py|yml|yaml|css|json|md|sh|ps1))(?![A-Za-z0-9_])"
+)
+
+# inotify event masks (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """Return True for 429s and 403 primary/secondary rate-limit responses."""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    return (
+        "retry-after" in response.headers
+        or response.headers.get("x-ratelimit-remaining") == "0"
+        or "rate limit" in response.text.lower()
+    )
+
+
+def rate_limit_wait(response: requests.Response) -> float:
+    """Seconds GitHub asks us to wait before retrying a rate-limited call."""
+    retry_after = response.headers.get("retry-after", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    reset = response.headers.get("x-ratelimit-reset", "")
+    if reset.isdigit():
+        return max(0.0, int(reset) - time.time())
+    # Secondary limits without headers: GitHub documents waiting a minute
+    return 60.0
+
+
+def is_allowed_api_url(url: str) -> bool:
+    """Return True for HTTPS URLs, or plain HTTP to a loopback stand-in.
+
+    SECURITY: Rejects file:// and custom schemes; plain HTTP is only
+    accepted for a local test server.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "https":
+        return True
+    return parsed.scheme == "http" and parsed.hostname in LOOPBACK_HOSTS
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def sign_app_jwt(
+    app_id: str, private_key: bytes, now: Optional[float] = None
+) -> str:
+    """Create the RS256 JWT a GitHub App uses to authenticate as itself.
+
+    Uses PyJWT when installed and falls back to the openssl CLI, so no extra
+    Python dependency is required.
+    """
+    now = int(now if now is not None else time.time())
+    # Backdate iat to tolerate clock drift; GitHub caps exp at 10 minutes
+    claims = {"iat": now - 60, "exp": now + 540, "iss": str(app_id)}
+    try:
+        import jwt  # PyJWT
+
+        return jwt.encode(claims, private_key, algorithm="RS256")
+    except ImportError:
+        pass
+
+    header = _b64url(json.dumps({"alg": "RS256", "typ": "JWT"}).encode("utf-8"))
+    payload = _b64url(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signing_input = f"{header}.{payload}".encode("ascii")
+    with tempfile.NamedTemporaryFile(delete=False) as key_file:
+        key_file.write(private_key)
+    try:
+        # SECURITY: Command passed as list without shell=True is safe
+        result = subprocess.run(
+            ["openssl", "dgst", "-sha256", "-sign", key_file.name],
+            input=signing_input,
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(
+            "Signing the GitHub App JWT needs PyJWT[crypto] or the openssl CLI"
+        ) from e
+    finally:
+        os.unlink(key_file.name)
+    return f"{header}.{payload}.{_b64url(result.stdout)}"
+
+
+class AppTokenProvider:
+    """GitHub App installation tokens, cached until shortly before expiry.
+
+    The app JWT is signed locally and exchanged for an installation token,
+    which is reused for every request until it is within
+    APP_TOKEN_REFRESH_MARGIN seconds of expiring (or GitHub answers 401),
+    then refreshed transparently. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        private_key: bytes,
+        repo: Optional[str] = None,
+        installation_id: Optional[str] = None,
+        api_url: str = GITHUB_API,
+        timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+    ):
+        self.app_id = app_id
+        self.private_key = private_key
+        self.repo = repo
+        self.installation_id = installation_id
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def token(self) -> str:
+        """Return a valid installation token, refreshing it if needed."""
+        with self._lock:
+            if self._token is None or (
+                self._expires_at - time.time() < APP_TOKEN_REFRESH_MARGIN
+            ):
+                self._refresh()
+            return self._token
+
+    def invalidate(self) -> None:
+        """Drop the cached token (e.g. after a 401)."""
+        with self._lock:
+            self._token = None
+
+    def _app_request(self, method: str, url: str) -> Dict:
+        if not is_allowed_api_url(url):
+            raise ValueError(f"Invalid URL scheme. Only HTTPS is allowed: {url}")
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {sign_app_jwt(self.app_id, self.private_key)}",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        response = requests.request(method, url, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _refresh(self) -> None:
+        if not self.installation_id:
+            if not self.repo:
+                raise ValueError(
+                    "GitHub App auth needs --app-installation-id or --repo"
+                )
+            installation = self._app_request(
+                "GET", f"{self.api_url}/repos/{self.repo}/installation"
+            )
+            self.installation_id = str(installation["id"])
+        data = self._app_request(
+            "POST",
+            f"{self.api_url}/app/installations/{self.installation_id}/access_tokens",
+        )
+        expires_at = datetime.strptime(data["expires_at"], "%Y-%m-%dT%H:%M:%SZ")
+        self._expires_at = expires_at.replace(tzinfo=timezone.utc).timestamp()
+        self._token = data["token"]
 
 
 class GitHubAPI:
-    """Simple GitHub API client."""
+    """Simple GitHub API client.
+
+    token is either a personal access token or an AppTokenProvider; with a
+    provider the installation token is looked up per request and refreshed
+    once on a 401.
+    """
 
-    def __init__(self, token: str, repo: str):
+    def __init__(
+        self,
+        token,
+        repo: str,
+        budget: Optional[RateBudget] = None,
+        cache: Optional[HTTPCache] = None,
+        api_url: str = GITHUB_API,
+        timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        deadline: Optional[Deadline] = None,
+        controller: Optional[ConcurrencyController] = None,
+    ):
         self.token = token
         self.repo = repo  # Format: "owner/repo"
-        self.headers = {
+        self.budget = budget
+        self.cache = cache
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self.deadline = deadline or Deadline()
+        self.controller = controller
+        self.stats = {"reads": 0, "not_modified": 0}
+        self.milestones: Optional[Dict[str, int]] = None
+        self._milestone_lock = threading.Lock()
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        token = self.token
+        if isinstance(token, AppTokenProvider):
+            token = token.token()
+        return {
             "Accept": "application/vnd.github+json",
             "Authorization": f"Bearer {token}",
             "X-GitHub-Api-Version": "2022-11-28",
         }
 
-    def create_issue(self, title: str, body: str, labels: List[str]) -> Optional[Dict]:
-        """Create a GitHub issue.
+    def _send(
+        self,
+        method: str,
+        url: str,
+        extra_headers: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request, refreshing an app installation token once on 401.
+
+        Every request has connect/read timeouts, both capped by what is left
+        of the run's time budget.
 
         SECURITY: Validates URL scheme to prevent file:// or custom scheme access.
         """
-        url = f"{GITHUB_API}/repos/{self.repo}/issues"
-
         # SECURITY FIX: Validate URL scheme to prevent file:// or custom schemes
-        if not url.startswith("https://") or url.startswith("file://"):
-            print(f"[ERROR] Invalid URL scheme. Only HTTPS is allowed: {url}")
-            return None
+        if not is_allowed_api_url(url):
+            raise ValueError(f"Invalid URL scheme. Only HTTPS is allowed: {url}")
+
+        connect, read = self.timeout
+        kwargs["timeout"] = (self.deadline.cap(connect), self.deadline.cap(read))
+        extra_headers = extra_headers or {}
+        response = requests.request(
+            method, url, headers={**self.headers, **extra_headers}, **kwargs
+        )
+        if response.status_code == 401 and isinstance(self.token, AppTokenProvider):
+            self.token.invalidate()
+            kwargs["timeout"] = (self.deadline.cap(connect), self.deadline.cap(read))
+            response = requests.request(
+                method, url, headers={**self.headers, **extra_headers}, **kwargs
+            )
+        return response
 
-        data = {"title": title, "body": body, "labels": labels}
+    def get_json(self, url: str) -> Tuple[Any, Optional[str]]:
+        """GET a URL through the conditional-request cache.
 
+        Returns the decoded body and the next page URL from the Link header.
+        """
+        validators = self.cache.validators(url) if self.cache else {}
+        response = self._send("GET", url, validators)
+        self.stats["reads"] += 1
+        if response.status_code == 304 and self.cache:
+            cached = self.cache.load(url)
+            if cached is not None:
+                self.stats["not_modified"] += 1
+                return cached
+            # Body was evicted between validators() and load(): refetch
+            response = self._send("GET", url)
+        response.raise_for_status()
+        next_url = response.links.get("next", {}).get("url")
+        if self.cache:
+            self.cache.store(url, response, next_url)
+        return response.json(), next_url
+
+    def iter_pages(self, path: str, params: Dict[str, str]) -> Iterator[Dict]:
+        """Yield every item of a paginated repository collection."""
+        url = f"{self.api_url}/repos/{self.repo}/{path}?{urlencode(params)}"
+        while url:
+            items, url = self.get_json(url)
+            yield from items
+
+    def list_labels(self) -> List[Dict]:
+        """Return all labels of the repository."""
+        return list(self.iter_pages("labels", {"per_page": "100"}))
+
+    def list_issues(
+        self, labels: str = "security", state: str = "all"
+    ) -> Iterator[Dict]:
+        """Yield the repository's issues (not pull requests) with labels."""
+        params = {"labels": labels, "state": state, "per_page": "100"}
+        for issue in self.iter_pages("issues", params):
+            if "pull_request" not in issue:
+                yield issue
+
+    def milestone_number(self, title: str) -> Optional[int]:
+        """Return the number of the milestone titled title, or None.
+
+        The repository's milestones are listed once and kept for the run.
+        """
+        with self._milestone_lock:
+            if self.milestones is None:
+                params = {"state": "all", "per_page": "100"}
+                self.milestones = {
+                    milestone["title"]: milestone["number"]
+                    for milestone in self.iter_pages("milestones", params)
+                }
+        return self.milestones.get(title)
+
+    def create_label(self, name: str, color: str) -> bool:
+        """Create a label; returns False on failure."""
+        url = f"{self.api_url}/repos/{self.repo}/labels"
         try:
-            response = requests.post(
+            response = self._send(
+                "POST",
                 url,
-                data=json.dumps(data).encode("utf-8"),
-                headers=self.headers,
+                data=json.dumps({"name": name, "color": color}).encode("utf-8"),
             )
             response.raise_for_status()
+            return True
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"[ERROR] Could not create label {name}: {e}")
+            return False
+
+    def _write(self, method: str, url: str, payload: bytes) -> requests.Response:
+        """Send a write through the concurrency controller.
+
+        A rate-limited request is retried once after the wait GitHub asks for.
+        """
+        for attempt in range(2):
+            self.deadline.check()
+            if self.controller:
+                self.controller.acquire(self.deadline)
+            started = time.monotonic()
+            try:
+                response = self._send(method, url, data=payload)
+            except TimeBudgetExceeded:
+                if self.controller:
+                    self.controller.cancel()
+                raise
+            except requests.exceptions.RequestException:
+                if self.controller:
+                    self.controller.release(time.monotonic() - started, None, False)
+                raise
+            limited = is_rate_limited(response)
+            if self.controller:
+                self.controller.release(
+                    time.monotonic() - started, response.status_code, limited
+                )
+            if attempt or not limited:
+                break
+            wait = rate_limit_wait(response)
+            if wait > min(RATE_LIMIT_MAX_WAIT, self.deadline.remaining()):
+                break
+            print(f"[WARNING] Rate limited by GitHub, retrying in {wait:.0f}s")
+            time.sleep(wait)
+        return response
+
+    def create_issue(
+        self,
+        title: str,
+        body: str,
+        labels: List[str],
+        assignees: Optional[List[str]] = None,
+        milestone: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """Create a GitHub issue.
+
+        milestone is a title, looked up in the repository's milestones; an
+        unknown title is reported and the issue is created without one. If
+        GitHub rejects the assignees (e.g. the owner has no access to the
+        repository), the issue is created again without them.
+        """
+        url = f"{self.api_url}/repos/{self.repo}/issues"
+
+        data = {"title": title, "body": body, "labels": labels}
+        if assignees:
+            data["assignees"] = assignees
+
+        try:
+            if milestone is not None:
+                number = self.milestone_number(milestone)
+                if number is None:
+                    print(f"[WARNING] No milestone {milestone!r} in {self.repo}")
+                else:
+                    data["milestone"] = number
+
+            if self.budget:
+                self.budget.acquire(self.deadline)
+
+            response = self._write("POST", url, json.dumps(data).encode("utf-8"))
+            if response.status_code == 422 and assignees:
+                print(f"[WARNING] Assignees {assignees} rejected, retrying without")
+                return self.create_issue(title, body, labels, milestone=milestone)
+            response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
             print(f"[ERROR] HTTP {e.response.status_code}: {e.response.reason}")
@@ -73,6 +531,36 @@ class GitHubAPI:
             except json.JSONDecodeError:
                 print(f"[ERROR] {e.response.text}")
             return None
+        except TimeBudgetExceeded:
+            raise
+        except requests.exceptions.Timeout as e:
+            print(f"[ERROR] Request timed out: {e}")
+            return None
+        except Exception as e:
+            print(f"[ERROR] Unexpected error: {e}")
+            return None
+
+    def get_issue(self, number: int) -> Dict:
+        """Return an issue, read through the conditional-request cache."""
+        return self.get_json(f"{self.api_url}/repos/{self.repo}/issues/{number}")[0]
+
+    def update_issue(self, number: int, fields: Dict[str, Any]) -> Optional[Dict]:
+        """Set fields (title, body, labels) of an existing issue."""
+        url = f"{self.api_url}/repos/{self.repo}/issues/{number}"
+        data = fields
+
+        if self.budget:
+            self.budget.acquire(self.deadline)
+
+        try:
+            response = self._write("PATCH", url, json.dumps(data).encode("utf-8"))
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.HTTPError as e:
+            print(f"[ERROR] HTTP {e.response.status_code}: {e.response.reason}")
+            return None
+        except TimeBudgetExceeded:
+            raise
         except Exception as e:
             print(f"[ERROR] Unexpected error: {e}")
             return None
@@ -92,44 +580,310 @@ def parse_severity(text: str) -> str:
     return "medium"
 
 
-def get_labels(severity: str) -> List[str]:
-    """Get labels for severity."""
-    labels = ["security"]
+class PathIndex:
+    """Snapshot of the tracked files used to validate extracted paths.
 
-    if severity == "critical":
-        labels.extend(["security-critical", "priority-p0"])
-    elif severity == "high":
-        labels.extend(["security-high", "priority-p1"])
-    elif severity == "medium":
-        labels.extend(["security-medium", "priority-p2"])
-    else:
-        labels.extend(["security-low", "priority-p3"])
+    Besides the set of repository-relative paths, every proper path suffix
+    ("src/app.ts", "app.ts", ...) maps to the single tracked file it
+    identifies (or None when several files share it). Each lookup is a
+    handful of hash probes, i.e. O(path length).
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = set(paths)
+        self._digest: Optional[str] = None
+        self.suffixes: Dict[str, Optional[str]] = {}
+        for path in self.paths:
+            start = path.find("/")
+            while start != -1:
+                suffix = path[start + 1:]
+                if self.suffixes.get(suffix, path) != path:
+                    self.suffixes[suffix] = None
+                else:
+                    self.suffixes[suffix] = path
+                start = path.find("/", start + 1)
+
+    @classmethod
+    def from_git(cls) -> Optional["PathIndex"]:
+        """Build the index from `git ls-files`, or None outside a repository."""
+        output = _run_git(["ls-files", "-z", "--full-name"], Path("."))
+        if output is None:
+            return None
+        return cls(path for path in output.split("\0") if path)
+
+    @property
+    def digest(self) -> str:
+        """Hash of the tracked paths, identifying this snapshot in caches."""
+        if self._digest is None:
+            joined = "\0".join(sorted(self.paths))
+            self._digest = hashlib.sha1(joined.encode("utf-8")).hexdigest()
+        return self._digest
+
+    def resolve(self, candidate: str) -> Optional[str]:
+        """Return the canonical repository-relative path, or None if unknown."""
+        if "://" in candidate:
+            return None
+        path = normalize_path(candidate.strip("`'\"()[]<>,;"))
+        if path in self.paths:
+            return path
+        if path in self.suffixes:
+            return self.suffixes[path]
+        # Absolute or CI workspace paths: drop leading directories until the
+        # remainder is a tracked file
+        start = path.find("/")
+        while start != -1:
+            if path[start + 1:] in self.paths:
+                return path[start + 1:]
+            start = path.find("/", start + 1)
+        return None
+
+
+class ReportParser:
+    """Incremental report parser.
+
+    Text can be fed in arbitrary chunks; incomplete trailing lines are held
+    back until the rest arrives and the current severity section is carried
+    across calls, so appending to a report and feeding only the new text
+    yields the same findings as parsing the whole file.
+
+    With a PathIndex, extracted paths are canonicalised. A finding whose
+    path is not a tracked file (untracked, generated, ambiguous or outside
+    the checkout) is kept as reported, flagged "path_unverified", counted
+    in unverified_paths and warned about, so no finding is lost.
+
+    With a SectionCache, lines are grouped into sections and only sections
+    not in the cache are parsed. Findings are then returned a section at a
+    time, so the cache is meant for whole-report parses, not --watch.
+    """
+
+    def __init__(
+        self,
+        path_index: Optional[PathIndex] = None,
+        cache: Optional[SectionCache] = None,
+    ):
+        self.current_severity = "MEDIUM"
+        self.path_index = path_index
+        self.unverified_paths = 0
+        self.cache = cache
+        self._pending = ""
+        self._section: List[str] = []
+
+    def feed(self, text: str) -> List[Dict[str, str]]:
+        """Parse all complete lines in text and return their findings."""
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        if self.cache:
+            return self._collect(lines)
+        return self._parse_lines(lines)
+
+    def flush(self) -> List[Dict[str, str]]:
+        """Parse any buffered partial line (call at end of input)."""
+        lines = [self._pending] if self._pending else []
+        self._pending = ""
+        if self.cache:
+            return self._collect(lines) + self._close_section()
+        return self._parse_lines(lines)
+
+    def _collect(self, lines: List[str]) -> List[Dict[str, str]]:
+        """Add lines to the current section, closing it at each heading."""
+        findings = []
+        for line in lines:
+            if self._section and (
+                line.startswith("#") or len(self._section) >= SECTION_MAX_LINES
+            ):
+                findings.extend(self._close_section())
+            self._section.append(line)
+        return findings
+
+    def _close_section(self) -> List[Dict[str, str]]:
+        """Return the findings of the buffered section, from the cache if known."""
+        lines, self._section = self._section, []
+        if not lines:
+            return []
+        index_digest = self.path_index.digest if self.path_index else ""
+        key = self.cache.key(self.current_severity, index_digest, lines)
+        entry = self.cache.get(key)
+        if entry is None:
+            findings = self._parse_lines(lines)
+            self.cache.put(
+                key,
+                {
+                    "findings": [dict(finding) for finding in findings],
+                    "severity": self.current_severity,
+                },
+            )
+            return findings
+        self.current_severity = entry["severity"]
+        findings = [dict(finding) for finding in entry["findings"]]
+        for finding in findings:
+            self._check_path(finding)
+        return findings
+
+    def _parse_lines(self, lines: List[str]) -> List[Dict[str, str]]:
+        findings = []
+        for line in lines:
+            self.current_severity = _update_severity(line, self.current_severity)
+            finding = _extract_finding_from_line(
+                line, self.current_severity, self.path_index
+            )
+            if finding:
+                self._check_path(finding)
+                findings.append(finding)
+        return findings
+
+    def _check_path(self, finding: Dict[str, str]) -> None:
+        """Count and warn about a finding kept with an untracked path."""
+        if finding.get("path_unverified"):
+            self.unverified_paths += 1
+            print(
+                f"[WARNING] {finding['file']}:{finding['line']} is not a file "
+                "tracked by git, kept as reported"
+            )
 
-    return labels
 
+def _zstd_reader(stream: io.BufferedReader) -> io.RawIOBase:
+    """Return a streaming zstd decompressor (Python 3.14+ or zstandard)."""
+    try:
+        from compression import zstd
 
-def parse_report() -> List[Dict[str, str]]:
-    """Parse SECURITY_SCAN_REPORT.md."""
-    if not REPORT_PATH.exists():
-        print(f"[ERROR] {REPORT_PATH} not found")
+        return zstd.ZstdFile(stream)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        print("[ERROR] Reading .zst needs Python 3.14+ or: pip install zstandard")
         sys.exit(1)
+    return zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
 
-    findings = []
-    with REPORT_PATH.open(encoding="utf-8", errors="ignore") as f:
-        content = f.read()
 
-    lines = content.split("\n")
-    current_severity = "MEDIUM"
+class _ReportReader(io.TextIOWrapper):
+    """Text stream over a (decompressed) report that also closes the file.
+
+    GzipFile, BZ2File and LZMAFile leave a file object passed to them open,
+    so the underlying file is closed here with the wrapper.
+    """
 
-    for line in lines:
-        current_severity = _update_severity(line, current_severity)
-        finding = _extract_finding_from_line(line, current_severity)
-        if finding:
-            findings.append(finding)
+    def __init__(self, stream: io.BufferedIOBase, raw: io.BufferedReader):
+        super().__init__(stream, encoding="utf-8", errors="ignore")
+        self._raw = raw
 
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+def _compression(magic: bytes) -> Optional[str]:
+    """Name the compression whose magic bytes start magic, if any."""
+    return next((name for sig, name in REPORT_MAGIC if magic.startswith(sig)), None)
+
+
+def is_compressed_report(report: Path) -> bool:
+    """Return True if a report file is compressed, by suffix or magic bytes."""
+    if report.suffix in COMPRESSED_SUFFIXES:
+        return True
+    try:
+        with report.open("rb") as f:
+            magic = f.read(max(len(sig) for sig, _ in REPORT_MAGIC))
+    except OSError:
+        return False
+    return _compression(magic) is not None
+
+
+def open_report(report: Path = REPORT_PATH) -> io.TextIOWrapper:
+    """Open a report (or - for stdin) as a decoded text stream.
+
+    gzip, bz2, xz and zstd inputs are recognised by their magic bytes, not
+    the file name, and decompressed on the fly, so compressed CI artifacts
+    are parsed without writing the expanded report to disk.
+    """
+    if str(report) == "-":
+        # A separate reader on the descriptor, so closing the report leaves
+        # sys.stdin usable (confirm_creation still checks it)
+        raw = open(sys.stdin.fileno(), "rb", closefd=False)
+    elif not report.exists():
+        print(f"[ERROR] {report} not found")
+        sys.exit(1)
+    else:
+        raw = report.open("rb")
+
+    kind = _compression(raw.peek(max(len(sig) for sig, _ in REPORT_MAGIC)))
+    if kind == "gzip":
+        stream = gzip.GzipFile(fileobj=raw)
+    elif kind == "bz2":
+        stream = bz2.BZ2File(raw)
+    elif kind == "xz":
+        stream = lzma.LZMAFile(raw)
+    elif kind == "zstd":
+        stream = io.BufferedReader(_zstd_reader(raw))
+    else:
+        stream = raw
+    return _ReportReader(stream, raw)
+
+
+def parse_report(
+    path_index: Optional[PathIndex] = None,
+    report: Path = REPORT_PATH,
+    cache: Optional[SectionCache] = None,
+) -> List[Dict[str, str]]:
+    """Parse SECURITY_SCAN_REPORT.md (or another, possibly compressed, report).
+
+    With a SectionCache, only sections changed since an earlier run are
+    parsed; the result is the same as a full parse.
+    """
+    parser = ReportParser(path_index, cache)
+    findings = []
+    with open_report(report) as f:
+        # Bounded chunks keep memory flat for very large reports
+        while chunk := f.read(REPORT_READ_CHUNK):
+            findings.extend(parser.feed(chunk))
+    findings.extend(parser.flush())
+    if parser.unverified_paths:
+        print(
+            f"[WARNING] {parser.unverified_paths} findings have file paths not "
+            "tracked by git"
+        )
     return findings
 
 
+def merge_reports(
+    path_index: Optional[PathIndex],
+    reports: List[Path],
+    cache: Optional[SectionCache] = None,
+) -> Tuple[List[Dict[str, str]], int]:
+    """Parse reports in parallel and merge them into one deduplicated list.
+
+    Each worker parses one report and sorts it by fingerprint_order (line
+    numbers compared numerically); merge_sorted_runs then k-way merges the
+    runs, drops duplicates by comparing adjacent keys and restores report
+    order, so the report listed first wins where reports disagree. Returns
+    the findings and the number of duplicates dropped.
+    """
+
+    def parse_one(numbered: Tuple[int, Path]) -> List[Tuple]:
+        number, report = numbered
+        findings = parse_report(path_index, report, cache)
+        print(f"   {report}: {len(findings)} findings")
+        return sorted_run(number, findings, fingerprint_order)
+
+    with ThreadPoolExecutor(max_workers=min(len(reports), os.cpu_count() or 1)) as pool:
+        runs = list(pool.map(parse_one, enumerate(reports)))
+    return merge_sorted_runs(runs)
+
+
+def iter_report_findings(
+    path_index: Optional[PathIndex] = None, report: Path = REPORT_PATH
+) -> Iterator[Dict[str, str]]:
+    """Yield findings while reading the report line by line."""
+    parser = ReportParser(path_index)
+    with open_report(report) as f:
+        for line in f:
+            yield from parser.feed(line)
+    yield from parser.flush()
+
+
 def _update_severity(line: str, current_severity: str) -> str:
     """Update current severity based on line content."""
     if "CRITICAL" in line.upper() or "Critical" in line:
@@ -141,8 +895,16 @@ def _update_severity(line: str, current_severity: str) -> str:
     return current_severity
 
 
-def _extract_finding_from_line(line: str, current_severity: str) -> Optional[Dict[str, str]]:
-    """Extract finding data from a single line."""
+def _extract_finding_from_line(
+    line: str, current_severity: str, path_index: Optional[PathIndex] = None
+) -> Optional[Dict[str, str]]:
+    """Extract finding data from a single line.
+
+    Returns None when the line mentions no file (URLs don't count). With a
+    path index, the first mentioned path that is a tracked file is used;
+    when none of them is, the first path is kept as written and the finding
+    is flagged "path_unverified".
+    """
     if not any(
         ext in line
         for ext in [
@@ -162,13 +924,21 @@ def _extract_finding_from_line(line: str, current_severity: str) -> Optional[Dic
     ):
         return None
 
-    file_match = re.search(
-        r"([^\s|]+\.(ts|tsx|js|jsx|py|yml|yaml|css|json|md|sh|ps1))", line
-    )
-    if not file_match:
-        return None
+    if path_index is None:
+        file_match = FILE_PATH_RE.search(line)
+        if not file_match:
+            return None
+        file_path = file_match.group(1).strip("`")
+    else:
+        candidates = [
+            m.group(1) for m in FILE_PATH_RE.finditer(line) if "://" not in m.group(1)
+        ]
+        if not candidates:
+            return None
+        file_path = next(
+            (p for p in map(path_index.resolve, candidates) if p is not None), None
+        )
 
-    file_path = file_match.group(1).strip("`")
     line_num = _extract_line_number(line)
     severity = _determine_severity(line, current_severity)
     summary = _create_summary(line)
@@ -179,6 +949,9 @@ def _extract_finding_from_line(line: str, current_severity: str) -> Optional[Dic
         "line": line_num,
         "summary": summary,
     }
+    if path_index is not None and file_path is None:
+        finding["file"] = candidates[0].strip("`")
+        finding["path_unverified"] = True
 
     return finding
 
@@ -209,12 +982,55 @@ def _create_summary(line: str) -> str:
     return summary
 
 
-def create_issue_for_finding(
-    api: GitHubAPI, finding: Dict[str, str], dry_run: bool
-) -> bool:
-    """Create GitHub issue for a finding."""
+def content_hash(title: str, body: str, labels: Iterable[str]) -> str:
+    """Hash of the rendered issue content that an update would send."""
+    key = "\0".join([title, body.replace("\r\n", "\n"), ",".join(sorted(labels))])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def body_hash(body: str) -> str:
+    """Hash of an issue body with its task boxes unticked.
+
+    Ticking "Required Actions" boxes on GitHub leaves this hash unchanged,
+    so a body differing from the one last sent in any other way is known to
+    have been edited by hand.
+    """
+    unticked = TASK_RE.sub(r"- [ ] \2", body.replace("\r\n", "\n"))
+    return hashlib.sha1(unticked.encode("utf-8")).hexdigest()
+
+
+def carry_ticked_tasks(current: str, body: str) -> str:
+    """Tick the task boxes in body that are ticked in the current issue body."""
+    ticked = {
+        text.strip()
+        for mark, text in TASK_RE.findall(current.replace("\r\n", "\n"))
+        if mark != " "
+    }
+    return TASK_RE.sub(
+        lambda m: f"- [x] {m.group(2)}" if m.group(2).strip() in ticked else m.group(0),
+        body,
+    )
+
+
+def format_collapsed(finding: Dict[str, str]) -> str:
+    """Format the other findings that share this finding's location."""
+    if not finding.get("collapsed"):
+        return ""
+    lines = "\n".join(f"- {summary}" for summary in finding["collapsed"])
+    return f"\n**Also reported at this location:**\n{lines}\n"
+
+
+def render_issue(finding: Dict[str, str], repo: Optional[str] = None) -> Dict:
+    """Render a finding into a plan record (everything needed to file it).
+
+    The fingerprint is embedded in the body as an HTML comment so --sync
+    can rebuild the local state from the issues on GitHub.
+    """
+    fingerprint = finding_fingerprint(finding)
     severity = finding["severity"].upper()
-    labels = get_labels(finding["severity"])
+    labels = finding.get("labels") or get_labels(finding["severity"])
+    assignees = [finding["owner"]] if finding.get("owner") else []
+    assignees += [a for a in finding.get("rule_assignees", []) if a not in assignees]
 
     # Title
     title = f"[{severity}] Security Issue - {finding['file']}:{finding['line']}"
@@ -230,7 +1046,7 @@ def create_issue_for_finding(
 
 ### Description
 {finding["summary"]}
-
+{format_collapsed(finding)}{format_snippet(finding)}
 ### Source
 Auto-generated from `SECURITY_SCAN_REPORT.md`
 
@@ -244,21 +1060,1026 @@ Auto-generated from `SECURITY_SCAN_REPORT.md`
 ### References
 - [Security Process](../SECURITY_PROCESS.md)
 - [Security Policy](../SECURITY.md)
+
+<!-- security-finding: {fingerprint} -->
 """
 
+    return {
+        "repo": repo,
+        "fingerprint": fingerprint,
+        "content_hash": content_hash(title, body, labels),
+        "title": title,
+        "body": body,
+        "labels": labels,
+        "assignees": assignees,
+        "milestone": finding.get("milestone"),
+    }
+
+
+def create_issue_from_record(
+    api: GitHubAPI,
+    record: Dict,
+    dry_run: bool,
+    prefix: str = "",
+    state: Optional[IssueState] = None,
+    journal: Optional[RunJournal] = None,
+    output: Optional[ResultOutput] = None,
+) -> bool:
+    """File a rendered plan record, recording the outcome in state and journal.
+
+    Result lines and records go to output (plain print if None).
+    """
+    title = record["title"]
+    say = output.line if output else print
     if dry_run:
-        print(f"[DRY-RUN] Would create: {title}")
+        say(f"{prefix}[DRY-RUN] Would create: {title}")
+        if journal:
+            journal.record(record["repo"], record, "dry-run")
+        if output:
+            output.result(record["repo"], record, "dry-run")
         return True
 
-    result = api.create_issue(title, body, labels)
+    result = api.create_issue(
+        title,
+        record["body"],
+        record["labels"],
+        record.get("assignees") or None,
+        record.get("milestone"),
+    )
     if result:
-        print(f"[OK] Created issue #{result['number']}: {title}")
+        say(f"{prefix}[OK] Created issue #{result['number']}: {title}")
+        if state:
+            state.record(
+                api.repo,
+                record["fingerprint"],
+                result["number"],
+                record.get("content_hash"),
+                body_hash(record["body"]),
+            )
+        if journal:
+            journal.record(api.repo, record, "created", result["number"])
+        if output:
+            output.result(api.repo, record, "created", result["number"])
         return True
     else:
-        print(f"[ERROR] Failed: {title}")
+        say(f"{prefix}[ERROR] Failed: {title}")
+        if journal:
+            journal.record(api.repo, record, "failed")
+        if output:
+            output.result(api.repo, record, "failed")
         return False
 
 
+def create_issue_for_finding(
+    api: GitHubAPI,
+    finding: Dict[str, str],
+    dry_run: bool,
+    prefix: str = "",
+    state: Optional[IssueState] = None,
+    journal: Optional[RunJournal] = None,
+    repo: Optional[str] = None,
+    output: Optional[ResultOutput] = None,
+) -> bool:
+    """Create GitHub issue for a finding.
+
+    prefix is prepended to the result line, so progress output from
+    concurrent uploads stays on one line per finding. Created issues are
+    recorded in state, and every outcome in journal.
+    """
+    record = render_issue(finding, api.repo if api else repo)
+    return create_issue_from_record(
+        api, record, dry_run, prefix, state, journal, output
+    )
+
+
+def write_plan(
+    path: str, router: "IssueRouter", findings: List[Dict[str, str]]
+) -> int:
+    """Write one NDJSON plan record per finding; return the record count."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for finding in findings:
+            record = render_issue(finding, router.route(finding))
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def apply_plan(
+    router: "IssueRouter", path: str
+) -> Tuple[Dict[str, Tuple[int, int]], int]:
+    """Upload the records of a plan file without reparsing the report.
+
+    Records already filed according to the local state are skipped, so an
+    interrupted apply can simply be rerun. Returns per-repository counts and
+    the number of records left unattempted when the time budget ran out.
+    Malformed records count as failed for the default repository.
+    """
+    print(f"Applying plan {path}...")
+    print()
+
+    counts: Dict[str, Tuple[int, int]] = {}
+    skipped = 0
+    left = 0
+    records = iter_plan(path, PLAN_FIELDS)
+    try:
+        for number, record in enumerate(records, 1):
+            if record is None:
+                repo = router.default_repo or "(invalid)"
+                created, failed = counts.get(repo, (0, 0))
+                counts[repo] = (created, failed + 1)
+                continue
+            repo = record.get("repo") or router.default_repo
+            if not repo:
+                print(f"[{number}] [SKIPPED] No repository for: {record['title']}")
+                continue
+            if not router.in_shard(record["fingerprint"]):
+                continue
+            if router.state.get(repo, record["fingerprint"]):
+                skipped += 1
+                continue
+            prefix = f"[{number}] "
+            if router.repo_count > 1 or repo != router.default_repo:
+                prefix = f"[{repo}] {prefix}"
+            created, failed = counts.get(repo, (0, 0))
+            try:
+                ok = create_issue_from_record(
+                    router.api(repo),
+                    record,
+                    False,
+                    prefix,
+                    router.state,
+                    router.journal,
+                    router.output,
+                )
+            except TimeBudgetExceeded:
+                left = 1 + sum(1 for _ in records)
+                break
+            if ok:
+                counts[repo] = (created + 1, failed)
+            else:
+                counts[repo] = (created, failed + 1)
+    finally:
+        router.state.save()
+
+    if skipped:
+        print(f"[SKIPPED] {skipped} plan records already filed")
+    return counts, left
+
+
+class CodeOwners:
+    """Minimal CODEOWNERS matcher (last matching pattern wins)."""
+
+    def __init__(self, root: Path):
+        self.rules: List[Tuple[re.Pattern, List[str]]] = []
+        for candidate in CODEOWNERS_PATHS:
+            path = root / candidate
+            if path.exists():
+                self._load(path)
+                break
+
+    def _load(self, path: Path) -> None:
+        for raw in path.read_text(encoding="utf-8", errors="ignore").splitlines():
+            line = raw.split("#", 1)[0].strip()
+            if not line:
+                continue
+            pattern, *owners = line.split()
+            # Teams and e-mail owners cannot be issue assignees
+            users = [o[1:] for o in owners if o.startswith("@") and "/" not in o]
+            self.rules.append((_codeowners_regex(pattern), users))
+
+    def owners(self, path: str) -> List[str]:
+        """Return the user owners for a repository-relative path."""
+        for regex, users in reversed(self.rules):
+            if regex.match(path):
+                return users
+        return []
+
+
+def _codeowners_regex(pattern: str) -> re.Pattern:
+    """Translate a CODEOWNERS (gitignore-style) pattern to a regex."""
+    anchored = pattern.startswith("/") or "/" in pattern.strip("/")
+    body = pattern.strip("/")
+    regex = ""
+    i = 0
+    while i < len(body):
+        if body.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif body.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif body[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif body[i] == "?":
+            regex += "[^/]"
+            i += 1
+        else:
+            regex += re.escape(body[i])
+            i += 1
+    prefix = "^" if anchored else "^(?:.*/)?"
+    return re.compile(prefix + regex + "(?:/.*)?$")
+
+
+def _run_git(args: List[str], cwd: Path) -> Optional[str]:
+    """Run a git command and return stdout, or None on failure."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            check=True,
+        )
+        return result.stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_incremental_blame(output: str) -> List[List]:
+    """Parse `git blame --incremental` into sorted [start, count, author] ranges.
+
+    The author is the GitHub login when the commit e-mail is a GitHub
+    noreply address, otherwise the e-mail itself.
+    """
+    authors: Dict[str, str] = {}
+    ranges = []
+    current = None
+    for line in output.splitlines():
+        if BLAME_HEADER_RE.match(line):
+            sha, _, final, count = line.split()
+            current = (sha, int(final), int(count))
+        elif line.startswith("author-mail ") and current:
+            email = line[len("author-mail "):].strip("<>")
+            match = NOREPLY_EMAIL_RE.match(email)
+            authors[current[0]] = match.group(1) if match else email
+        elif line.startswith("filename ") and current:
+            sha, final, count = current
+            ranges.append([final, count, authors.get(sha, "")])
+            current = None
+    ranges.sort()
+    return ranges
+
+
+class OwnerResolver:
+    """Assign findings to an owner from git blame and CODEOWNERS.
+
+    Each distinct file is blamed at most once per run (in a worker pool) and
+    blame results are cached on disk by blob hash, so unchanged files are
+    never blamed again in later runs. The line's last author is used when it
+    maps to a GitHub login; otherwise the first CODEOWNERS user owner.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        toplevel = _run_git(["rev-parse", "--show-toplevel"], Path("."))
+        self.root = Path(toplevel.strip()) if toplevel else None
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self.codeowners = CodeOwners(self.root or Path("."))
+        self.blobs = self._load_blobs()
+        self.cache = self._load_cache()
+        self._used = set()
+
+    def _load_blobs(self) -> Dict[str, str]:
+        if not self.root:
+            return {}
+        output = _run_git(["ls-tree", "-r", "-z", "--full-tree", "HEAD"], self.root)
+        blobs = {}
+        for entry in (output or "").split("\0"):
+            meta, _, path = entry.partition("\t")
+            parts = meta.split()
+            if len(parts) == 3 and parts[1] == "blob":
+                blobs[path] = parts[2]
+        return blobs
+
+    def _load_cache(self) -> Dict[str, List[List]]:
+        try:
+            with BLAME_CACHE_PATH.open(encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save_cache(self) -> None:
+        """Persist the blame cache, keeping the most recently used entries."""
+        for blob in self._used:
+            self.cache[blob] = self.cache.pop(blob)
+        entries = list(self.cache.items())[-BLAME_CACHE_MAX_ENTRIES:]
+        STATE_DIR.mkdir(exist_ok=True)
+        tmp = BLAME_CACHE_PATH.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(dict(entries), f, separators=(",", ":"))
+        os.replace(tmp, BLAME_CACHE_PATH)
+
+    def _blame(self, path: str) -> Tuple[str, List[List]]:
+        output = _run_git(["blame", "--incremental", "HEAD", "--", path], self.root)
+        return path, _parse_incremental_blame(output or "")
+
+    def enrich(self, findings: List[Dict[str, str]]) -> int:
+        """Set finding["owner"] where an owner can be found; return the count."""
+        paths = {normalize_path(f["file"]) for f in findings}
+        missing = {
+            path
+            for path in paths
+            if path in self.blobs and self.blobs[path] not in self.cache
+        }
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for path, ranges in executor.map(self._blame, missing):
+                    self.cache[self.blobs[path]] = ranges
+
+        assigned = 0
+        for finding in findings:
+            owner = self.owner_for(normalize_path(finding["file"]), finding["line"])
+            if owner:
+                finding["owner"] = owner
+                assigned += 1
+        return assigned
+
+    def owner_for(self, path: str, line: str) -> Optional[str]:
+        """Return the owner login for path:line, if any."""
+        blob = self.blobs.get(path)
+        ranges = self.cache.get(blob) if blob else None
+        if blob and ranges is not None:
+            self._used.add(blob)
+        if ranges and line.isdigit():
+            idx = bisect.bisect_right(ranges, [int(line), float("inf")]) - 1
+            if idx >= 0:
+                start, count, author = ranges[idx]
+                if start <= int(line) < start + count and author and "@" not in author:
+                    return author
+        owners = self.codeowners.owners(path)
+        return owners[0] if owners else None
+
+
+class InotifyWaiter:
+    """Block until a file changes, using Linux inotify through libc."""
+
+    def __init__(self, path: Path):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_DELETE_SELF | IN_MOVE_SELF
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def wait(self, timeout: float) -> None:
+        """Wait up to timeout seconds for an event and drain the queue."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return
+        try:
+            while os.read(self._fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWaiter:
+    """Fallback waiter for platforms without inotify."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(min(self.interval, timeout))
+
+    def close(self) -> None:
+        pass
+
+
+def _create_waiter(path: Path, interval: float):
+    """Return an inotify waiter on Linux, or a polling waiter otherwise."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWaiter(path)
+        except (OSError, AttributeError) as e:
+            print(f"[WARNING] inotify unavailable ({e}), polling every {interval}s")
+    return PollingWaiter(interval)
+
+
+def watch_report(
+    on_finding: Callable[[Dict[str, str]], None],
+    interval: float = 1.0,
+    idle_timeout: float = 0,
+    path_index: Optional[PathIndex] = None,
+    report: Path = REPORT_PATH,
+    deadline: Optional[Deadline] = None,
+) -> None:
+    """Tail the report and pass each newly appended finding to on_finding.
+
+    Only bytes appended since the last read are decoded and parsed; the
+    parser keeps its severity section between reads. If the report is
+    truncated or replaced, it is reparsed from the start and findings that
+    were already seen are skipped. Returns after idle_timeout seconds without
+    growth (0 = run until interrupted).
+    """
+    while not report.exists():
+        print(f"[WAITING] {report} does not exist yet")
+        time.sleep(interval)
+
+    seen = set()
+    parser = ReportParser(path_index)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    handle = report.open("rb")
+    inode = os.fstat(handle.fileno()).st_ino
+    waiter = _create_waiter(report, interval)
+    last_growth = time.monotonic()
+
+    try:
+        while True:
+            chunk = handle.read()
+            if chunk:
+                last_growth = time.monotonic()
+                for finding in parser.feed(decoder.decode(chunk)):
+                    key = (finding["file"], finding["line"], finding["summary"])
+                    if key not in seen:
+                        seen.add(key)
+                        on_finding(finding)
+                continue
+
+            try:
+                stat = report.stat()
+            except FileNotFoundError:
+                stat = None
+            if stat is not None and (
+                stat.st_ino != inode or stat.st_size < handle.tell()
+            ):
+                print(f"[WATCH] {report} was replaced or truncated, rereading")
+                handle.close()
+                waiter.close()
+                handle = report.open("rb")
+                inode = os.fstat(handle.fileno()).st_ino
+                waiter = _create_waiter(report, interval)
+                parser = ReportParser(path_index)
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+                continue
+
+            if idle_timeout and time.monotonic() - last_growth >= idle_timeout:
+                break
+            if deadline and deadline.expired():
+                print("[WATCH] Time budget exhausted")
+                break
+            waiter.wait(min(interval, deadline.remaining()) if deadline else interval)
+    except KeyboardInterrupt:
+        print()
+        print("[WATCH] Interrupted")
+    finally:
+        for finding in parser.flush():
+            key = (finding["file"], finding["line"], finding["summary"])
+            if key not in seen:
+                seen.add(key)
+                on_finding(finding)
+        handle.close()
+        waiter.close()
+
+
+def run_watch(
+    router: "IssueRouter",
+    args: argparse.Namespace,
+    owners: Optional[OwnerResolver] = None,
+    snippets: Optional[SourceSnippets] = None,
+    path_index: Optional[PathIndex] = None,
+) -> Dict[str, Tuple[int, int]]:
+    """Stream findings from the growing report to the uploader."""
+    print(f"Watching {args.reports[0]} for new findings (Ctrl+C to stop)...")
+    print()
+
+    counts: Dict[str, Tuple[int, int]] = {}
+    fingerprints: Dict[str, Dict[str, str]] = {}
+
+    def upload(finding: Dict[str, str]) -> None:
+        repo = router.route(finding)
+        if repo is None:
+            print(f"[SKIPPED] No repository route for {finding['file']}")
+            return
+        fingerprint = finding_fingerprint(finding)
+        if not router.in_shard(fingerprint) or router.deadline.expired():
+            return
+        if fingerprint in fingerprints:
+            note_collapse(fingerprints[fingerprint], finding)
+            return
+        if router.state.get(repo, fingerprint):
+            return
+        fingerprints[fingerprint] = finding
+        if owners:
+            owners.enrich([finding])
+        if snippets:
+            snippets.attach([finding])
+        created, failed = counts.get(repo, (0, 0))
+        prefix = f"[{created + failed + 1}] "
+        if router.repo_count > 1:
+            prefix = f"[{repo}] {prefix}"
+        try:
+            ok = create_issue_for_finding(
+                router.api(repo),
+                finding,
+                args.dry_run,
+                prefix,
+                router.state,
+                router.journal,
+                repo,
+                router.output,
+            )
+        except TimeBudgetExceeded:
+            return
+        if ok:
+            counts[repo] = (created + 1, failed)
+        else:
+            counts[repo] = (created, failed + 1)
+
+    try:
+        watch_report(
+            upload,
+            args.watch_interval,
+            args.watch_idle,
+            path_index,
+            args.reports[0],
+            router.deadline,
+        )
+    finally:
+        router.state.save()
+        if owners:
+            owners.save_cache()
+    return counts
+
+
+def run_pipeline(
+    router: "IssueRouter",
+    args: argparse.Namespace,
+    owners: Optional[OwnerResolver] = None,
+    snippets: Optional[SourceSnippets] = None,
+    path_index: Optional[PathIndex] = None,
+) -> Tuple[Dict[str, Tuple[int, int]], int]:
+    """Parse and upload concurrently through a bounded priority queue.
+
+    A producer thread parses the report line by line and enqueues findings
+    ordered critical > high > medium > low (report order within a
+    severity); args.workers consumer threads upload them. The producer
+    blocks when args.queue_size findings are waiting, which bounds memory
+    regardless of report size. Returns per-repository counts and the number
+    of unrouted findings.
+
+    An exception in any thread (including the SystemExit of a missing or
+    corrupt report) stops the producer, lets the consumers drain the queue
+    and is re-raised here once every thread has finished.
+    """
+    source = describe_reports(args.reports)
+    print(f"Streaming {source} to {args.workers} upload workers...")
+    print()
+
+    work: "queue.PriorityQueue" = queue.PriorityQueue(maxsize=args.queue_size)
+    sequence = itertools.count()
+    started = itertools.count(1)
+    lock = threading.Lock()
+    counts: Dict[str, Tuple[int, int]] = {}
+    first_created: Dict[str, float] = {}
+    unrouted = [0]
+    errors: List[BaseException] = []
+    start = time.monotonic()
+
+    def produce() -> None:
+        fingerprints: Dict[str, Dict[str, str]] = {}
+        try:
+            findings = itertools.chain.from_iterable(
+                iter_report_findings(path_index, report) for report in args.reports
+            )
+            for finding in findings:
+                if errors or router.deadline.expired():
+                    break
+                repo = router.route(finding)
+                if repo is None:
+                    unrouted[0] += 1
+                    continue
+                fingerprint = finding_fingerprint(finding)
+                if not router.in_shard(fingerprint):
+                    continue
+                if fingerprint in fingerprints:
+                    note_collapse(fingerprints[fingerprint], finding)
+                    continue
+                if router.state.get(repo, fingerprint):
+                    continue
+                fingerprints[fingerprint] = finding
+                if owners:
+                    owners.enrich([finding])
+                if snippets:
+                    snippets.attach([finding])
+                priority = SEVERITY_PRIORITY.get(finding["severity"], 2)
+                work.put((priority, next(sequence), finding))
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            # Sentinels sort after every real finding
+            for _ in range(args.workers):
+                work.put((len(SEVERITY_PRIORITY), next(sequence), None))
+
+    def consume() -> None:
+        while True:
+            _, _, finding = work.get()
+            if finding is None:
+                return
+            if errors or router.deadline.expired():
+                # Keep draining so the producer is never blocked on a full queue
+                continue
+            try:
+                upload(finding)
+            except BaseException as e:
+                errors.append(e)
+
+    def upload(finding: Dict[str, str]) -> None:
+        repo = router.route(finding)
+        with lock:
+            prefix = f"[{next(started)}] "
+        if router.repo_count > 1:
+            prefix = f"[{repo}] {prefix}"
+        try:
+            ok = create_issue_for_finding(
+                router.api(repo),
+                finding,
+                args.dry_run,
+                prefix,
+                router.state,
+                router.journal,
+                repo,
+                router.output,
+            )
+        except TimeBudgetExceeded:
+            return
+        with lock:
+            created, failed = counts.get(repo, (0, 0))
+            if ok:
+                counts[repo] = (created + 1, failed)
+                first_created.setdefault(finding["severity"], time.monotonic() - start)
+            else:
+                counts[repo] = (created, failed + 1)
+
+    producer = threading.Thread(target=produce, name="report-parser", daemon=True)
+    consumers = [
+        threading.Thread(target=consume, name=f"uploader-{i}", daemon=True)
+        for i in range(args.workers)
+    ]
+    producer.start()
+    for consumer in consumers:
+        consumer.start()
+    producer.join()
+    for consumer in consumers:
+        consumer.join()
+
+    router.state.save()
+    if owners:
+        owners.save_cache()
+    if errors:
+        raise errors[0]
+    print()
+    for severity in SEVERITY_PRIORITY:
+        if severity in first_created:
+            print(
+                f"First {severity.upper()} issue after {first_created[severity]:.1f}s"
+            )
+    return counts, unrouted[0]
+
+
+def run_queue(
+    router: "IssueRouter",
+    grouped: Dict[str, List[Dict[str, str]]],
+    workers: int,
+) -> Dict[str, Tuple[int, int]]:
+    """Enqueue findings in the shared job queue and upload with a worker pool.
+
+    Other invocations running against the same queue claim from the same
+    jobs, so they split the work instead of filing duplicates. Returns the
+    per-repository counts of this invocation's workers.
+    """
+    job_queue = JobQueue()
+    records, priorities = [], []
+    for repo, findings in grouped.items():
+        for finding in findings:
+            records.append(render_issue(finding, repo))
+            priorities.append(SEVERITY_PRIORITY.get(finding["severity"], 2))
+    added = job_queue.enqueue(records, priorities)
+    print(
+        f"Queued {added} new or retried jobs in {job_queue.path} "
+        f"({len(records) - added} known)"
+    )
+    print(f"Uploading with {workers} workers...")
+    print()
+
+    started = itertools.count(1)
+    lock = threading.Lock()
+    counts: Dict[str, Tuple[int, int]] = {}
+    owner = f"{platform.node()}:{os.getpid()}"
+
+    def work() -> None:
+        while not router.deadline.expired():
+            job = job_queue.claim(owner)
+            if job is None:
+                # Wait for jobs backing off after a failure, within the budget
+                available_at = job_queue.next_available()
+                if available_at is None:
+                    return
+                wait = max(0.0, available_at - time.time())
+                if wait >= router.deadline.remaining():
+                    return
+                time.sleep(wait)
+                continue
+            job_id, record = job
+            repo = record["repo"]
+            with lock:
+                prefix = f"[{next(started)}] "
+            if router.repo_count > 1:
+                prefix = f"[{repo}] {prefix}"
+            try:
+                ok = create_issue_from_record(
+                    router.api(repo),
+                    record,
+                    False,
+                    prefix,
+                    router.state,
+                    router.journal,
+                    router.output,
+                )
+            except TimeBudgetExceeded:
+                job_queue.release(job_id)
+                return
+            if ok:
+                filed = router.state.get(repo, record["fingerprint"])
+                job_queue.complete(job_id, filed["number"] if filed else None)
+            elif not job_queue.fail(job_id, "create issue failed"):
+                print(f"{prefix}[RETRY] Queued again after a backoff")
+                continue
+            with lock:
+                created, failed = counts.get(repo, (0, 0))
+                counts[repo] = (created + 1, failed) if ok else (created, failed + 1)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(work) for _ in range(workers)]:
+                future.result()
+    finally:
+        # Adopt issues filed by other invocations into the local state
+        for repo, fingerprint, number in job_queue.filed():
+            if router.state.get(repo, fingerprint) is None:
+                router.state.record(repo, fingerprint, number)
+        router.state.save()
+
+    totals = job_queue.counts()
+    print()
+    print(
+        "Queue: "
+        + ", ".join(f"{totals.get(state, 0)} {state}" for state in JOB_STATES)
+    )
+    return counts
+
+
+class IssueRouter:
+    """Route findings to repositories by longest matching path prefix.
+
+    With a RuleSet, a rule's repo takes precedence over the prefix routes
+    and the rules' labels, assignees and milestone are set on each finding
+    the first time it is routed. Findings that match no prefix go to the
+    default repository, if any.
+    One GitHubAPI client with its own RateBudget is kept per repository.
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, str],
+        default_repo: Optional[str],
+        token: Optional[str],
+        dry_run: bool,
+        rate_limit: Optional[float],
+        state: Optional[IssueState] = None,
+        api_url: str = GITHUB_API,
+        shard: Tuple[int, int] = (1, 1),
+        journal: Optional[RunJournal] = None,
+        timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        deadline: Optional[Deadline] = None,
+        controller: Optional[ConcurrencyController] = None,
+        rules: Optional[RuleSet] = None,
+        output: Optional[ResultOutput] = None,
+    ):
+        # Longest prefix first so the most specific route wins
+        self.routes = sorted(
+            ((normalize_path(prefix), repo) for prefix, repo in routes.items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self.default_repo = default_repo
+        self.token = token
+        self.dry_run = dry_run
+        self.rate_limit = rate_limit
+        self.state = state or IssueState()
+        self.api_url = api_url
+        self.shard = shard
+        self.journal = journal
+        self.timeout = timeout
+        self.deadline = deadline or Deadline()
+        self.controller = controller
+        self.rules = rules
+        self.output = output or ResultOutput()
+        self.cache = HTTPCache()
+        atexit.register(self.cache.save)
+        self._apis: Dict[str, GitHubAPI] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def repos(self) -> List[str]:
+        """All repositories this router can send findings to."""
+        repos = {repo for _, repo in self.routes}
+        if self.rules:
+            repos.update(self.rules.repos)
+        if self.default_repo:
+            repos.add(self.default_repo)
+        return sorted(repos)
+
+    @property
+    def repo_count(self) -> int:
+        return len(self.repos)
+
+    @property
+    def managed_labels(self) -> Set[str]:
+        """Labels this tool sets, and may therefore remove, on its issues."""
+        labels = set(LABEL_COLORS)
+        for severity in SEVERITY_PRIORITY:
+            labels.update(get_labels(severity))
+        if self.rules:
+            labels.update(self.rules.labels)
+        return labels
+
+    def route(self, finding: Dict[str, str]) -> Optional[str]:
+        """Return the repository a finding belongs to."""
+        if self.rules:
+            if "labels" not in finding:
+                self.rules.apply(finding)
+            if finding["repo"]:
+                return finding["repo"]
+        path = normalize_path(finding["file"])
+        for prefix, repo in self.routes:
+            if path.startswith(prefix):
+                return repo
+        return self.default_repo
+
+    def in_shard(self, fingerprint: str) -> bool:
+        """Return True if this run's --shard is responsible for a fingerprint."""
+        index, count = self.shard
+        return count == 1 or shard_of(fingerprint, count) == index
+
+    def partition(self, findings: List[Dict[str, str]]) -> Tuple[
+        Dict[str, List[Dict[str, str]]], List[Dict[str, str]], Dict[str, int]
+    ]:
+        """Split findings into per-repository lists of new work.
+
+        Returns the grouped findings, the unrouted findings, and counts of
+        skipped findings: "duplicate" (same fingerprint earlier in this
+        run), "filed" (already recorded in the local state) and "shard"
+        (handled by another --shard).
+        """
+        grouped: Dict[str, List[Dict[str, str]]] = {}
+        unrouted = []
+        skipped = {"duplicate": 0, "filed": 0, "shard": 0}
+        seen: Dict[Tuple[str, str], Dict[str, str]] = {}
+        for finding in findings:
+            repo = self.route(finding)
+            if repo is None:
+                unrouted.append(finding)
+                continue
+            fingerprint = finding_fingerprint(finding)
+            if not self.in_shard(fingerprint):
+                skipped["shard"] += 1
+            elif (repo, fingerprint) in seen:
+                skipped["duplicate"] += 1
+                note_collapse(seen[repo, fingerprint], finding)
+            elif self.state.get(repo, fingerprint):
+                skipped["filed"] += 1
+            else:
+                seen[repo, fingerprint] = finding
+                grouped.setdefault(repo, []).append(finding)
+        return grouped, unrouted, skipped
+
+    def filed(self, findings: List[Dict[str, str]]) -> List[Tuple[str, Dict, Dict]]:
+        """Return (repo, finding, state entry) for this shard's filed findings."""
+        filed = []
+        seen = set()
+        for finding in findings:
+            repo = self.route(finding)
+            if repo is None:
+                continue
+            fingerprint = finding_fingerprint(finding)
+            if (repo, fingerprint) in seen or not self.in_shard(fingerprint):
+                continue
+            seen.add((repo, fingerprint))
+            entry = self.state.get(repo, fingerprint)
+            if entry:
+                filed.append((repo, finding, entry))
+        return filed
+
+    def read_stats(self) -> Dict[str, int]:
+        """Total reads and 304 revalidations across all clients."""
+        with self._lock:
+            apis = list(self._apis.values())
+        return {
+            key: sum(api.stats[key] for api in apis)
+            for key in ("reads", "not_modified")
+        }
+
+    def api(self, repo: str) -> Optional[GitHubAPI]:
+        """Return the client used to write to a repository (None in dry-run)."""
+        if self.dry_run:
+            return None
+        return self.client(repo)
+
+    def client(self, repo: str) -> GitHubAPI:
+        """Return the shared client for a repository, creating it on first use."""
+        with self._lock:
+            if repo not in self._apis:
+                budget = RateBudget(self.rate_limit) if self.rate_limit else None
+                self._apis[repo] = GitHubAPI(
+                    self.token,
+                    repo,
+                    budget,
+                    self.cache,
+                    self.api_url,
+                    self.timeout,
+                    self.deadline,
+                    self.controller,
+                )
+            return self._apis[repo]
+
+
+def sync_repositories(router: IssueRouter) -> None:
+    """Rebuild local state from GitHub and create any missing labels.
+
+    Reads go through the ETag cache, so syncing an unchanged repository
+    costs only 304 responses.
+    """
+    wanted_labels = set(LABEL_COLORS)
+    for repo in router.repos:
+        api = router.client(repo)
+        try:
+            tracked = 0
+            total = 0
+            for issue in api.list_issues():
+                total += 1
+                match = FINGERPRINT_MARKER_RE.search(issue.get("body") or "")
+                if not match:
+                    continue
+                if router.state.get(repo, match.group(1)) is None:
+                    router.state.record(repo, match.group(1), issue["number"])
+                    tracked += 1
+            existing = {label["name"] for label in api.list_labels()}
+            created_labels = 0
+            if not router.dry_run:
+                for name in sorted(wanted_labels - existing):
+                    if api.create_label(name, LABEL_COLORS[name]):
+                        created_labels += 1
+        except TimeBudgetExceeded:
+            print(f"[TIME BUDGET] Sync stopped at {repo}, rerun --sync to finish")
+            break
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"[ERROR] Sync failed for {repo}: {e}")
+            continue
+        print(
+            f"[SYNC] {repo}: {total} security issues, {tracked} newly tracked, "
+            f"{created_labels} labels created "
+            f"({api.stats['reads']} reads, {api.stats['not_modified']} not modified)"
+        )
+    router.state.save()
+    router.cache.save()
+    print()
+
+
+def load_repo_routes(args: argparse.Namespace) -> Dict[str, str]:
+    """Load path prefix -> repository routes from --repo-map and --route."""
+    routes: Dict[str, str] = {}
+    if args.repo_map:
+        try:
+            with open(args.repo_map, encoding="utf-8") as f:
+                mapping = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[ERROR] Could not read repo map {args.repo_map}: {e}")
+            sys.exit(1)
+        if not isinstance(mapping, dict):
+            print("[ERROR] Repo map must be a JSON object of prefix -> owner/repo")
+            sys.exit(1)
+        routes.update(mapping)
+    for route in args.route or []:
+        prefix, sep, repo = route.partition("=")
+        if not sep or not repo:
+            print(f"[ERROR] Invalid --route {route!r}, expected PREFIX=owner/repo")
+            sys.exit(1)
+        routes[prefix] = repo
+    return routes
+
+
 def get_repo_from_git() -> Optional[str]:
     """Extract repo from git remote.
 
@@ -289,46 +2110,425 @@ def get_repo_from_git() -> Optional[str]:
     return None
 
 
+def positive_int(value: str) -> int:
+    """argparse type for integers >= 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """argparse type for numbers > 0."""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError("must be greater than 0")
+    return number
+
+
+def shard_spec(value: str) -> Tuple[int, int]:
+    """argparse type for --shard i/N with 1 <= i <= N."""
+    match = re.fullmatch(r"(\d+)/(\d+)", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError("expected i/N, e.g. 2/4")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError("shard index must be between 1 and N")
+    return index, count
+
+
 def setup_arguments() -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description="Create GitHub issues from security report"
     )
     parser.add_argument("--token", help="GitHub Personal Access Token")
+    parser.add_argument(
+        "--report",
+        nargs="+",
+        default=[str(REPORT_PATH)],
+        metavar="REPORT",
+        help="Reports or globs to read, parsed in parallel and merged without "
+        "duplicates; gzip/bz2/xz/zstd are detected and decompressed while "
+        f"streaming, - reads stdin (default: {REPORT_PATH})",
+    )
+    parser.add_argument(
+        "--app-id",
+        default=os.getenv("GITHUB_APP_ID"),
+        help="Authenticate as this GitHub App instead of a token "
+        "(env: GITHUB_APP_ID)",
+    )
+    parser.add_argument(
+        "--app-private-key",
+        default=os.getenv("GITHUB_APP_PRIVATE_KEY_PATH"),
+        help="PEM private key file of the GitHub App "
+        "(env: GITHUB_APP_PRIVATE_KEY_PATH or GITHUB_APP_PRIVATE_KEY)",
+    )
+    parser.add_argument(
+        "--app-installation-id",
+        default=os.getenv("GITHUB_APP_INSTALLATION_ID"),
+        help="Installation to use; looked up from --repo when omitted",
+    )
+    parser.add_argument(
+        "--api-url",
+        default=GITHUB_API,
+        help="GitHub API base URL (env: GITHUB_API_URL, default: %(default)s)",
+    )
     parser.add_argument("--repo", help="Repository (owner/repo)")
+    parser.add_argument(
+        "--repo-map",
+        help="JSON file mapping path prefixes to repositories "
+        '(e.g. {"backend/": "owner/backend"}); unmatched findings go to --repo',
+    )
+    parser.add_argument(
+        "--route",
+        action="append",
+        metavar="PREFIX=OWNER/REPO",
+        help="Route findings under PREFIX to a repository (repeatable)",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=CONNECT_TIMEOUT,
+        help="Seconds to wait for a connection to GitHub (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=READ_TIMEOUT,
+        help="Seconds to wait for a GitHub response (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Stop cleanly after this many seconds, cutting off in-flight "
+        "requests, and report the findings left for the next run",
+    )
+    parser.add_argument(
+        "--rules",
+        metavar="FILE",
+        help="JSON rules file mapping path globs, summary regexes and "
+        "severities to labels, assignees, milestone and target repository",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=positive_float,
+        help="Maximum issue creations per minute for each repository "
+        f"(default: {FANOUT_RATE_LIMIT:g} when findings are routed to several "
+        "repositories, otherwise unpaced)",
+    )
     parser.add_argument(
         "--dry-run", action="store_true", help="Don't actually create issues"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--output",
+        choices=("text", "jsonl"),
+        default="text",
+        help="text: one line per finding; jsonl: one compact JSON record per "
+        "finding result on stdout, with the log on stderr (default: text)",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Don't print a line per finding; show a progress line on "
+        "terminals and the summary only",
+    )
+    parser.add_argument(
+        "--assign-owners",
+        action="store_true",
+        help="Assign each issue to the line's last author (git blame) "
+        "or the file's CODEOWNERS owner",
+    )
+    parser.add_argument(
+        "--no-path-index",
+        action="store_true",
+        help="Use file paths as written instead of resolving them to the files "
+        "tracked by git (findings with untracked paths are kept either way)",
+    )
+    parser.add_argument(
+        "--no-section-cache",
+        action="store_true",
+        help="Parse every report section instead of reusing unchanged "
+        f"sections from {SECTION_CACHE_PATH}",
+    )
+    parser.add_argument(
+        "--context-lines",
+        type=int,
+        default=0,
+        help="Lines of source shown around the finding in the issue body, read "
+        "only from files tracked in the repository (default: 0, off)",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Before creating issues, rebuild the local state from existing "
+        "GitHub issues and create missing labels (cached conditional reads)",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Also update already-filed issues in place (PATCH) when their "
+        "rendered title, body or labels changed; unchanged issues are skipped "
+        "by comparing content hashes kept in the local state",
+    )
+    parser.add_argument(
+        "--write-plan",
+        metavar="FILE",
+        help="With --dry-run, write the rendered issues as an NDJSON plan "
+        "for a later --apply",
+    )
+    parser.add_argument(
+        "--apply",
+        metavar="FILE",
+        help="Create the issues in an NDJSON plan file (- for stdin) "
+        "without reading the report",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Estimate API calls, quota use and wall time without any "
+        "network access",
+    )
+    parser.add_argument(
+        "--plan-latency",
+        type=float,
+        default=0.7,
+        help="Assumed seconds per issue creation request for --plan "
+        "(default: 0.7)",
+    )
+    parser.add_argument(
+        "--plan-hourly-quota",
+        type=int,
+        default=5000,
+        help="Primary rate limit per hour assumed by --plan (default: 5000)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Upload while parsing, most severe findings first",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=4,
+        help="Upload workers for --stream and --queue, and the ceiling of "
+        "the adaptive in-flight limit (default: 4)",
+    )
+    parser.add_argument(
+        "--fixed-concurrency",
+        action="store_true",
+        help="Keep every worker busy instead of adapting the in-flight "
+        "request count to GitHub's latency and rate-limit responses",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="Write run metrics (counts, duration, concurrency controller "
+        "state) as JSON",
+    )
+    parser.add_argument(
+        "--queue",
+        action="store_true",
+        help=f"Upload through the shared SQLite job queue ({QUEUE_PATH}) so "
+        "concurrent invocations split the work instead of duplicating it",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=positive_int,
+        default=1000,
+        help="Maximum parsed findings waiting for upload in --stream "
+        "(default: 1000)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Tail the report and create issues as findings are appended",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=1.0,
+        help="Polling interval in seconds when inotify is unavailable (default: 1)",
+    )
+    parser.add_argument(
+        "--watch-idle",
+        type=float,
+        default=0,
+        help="Stop watching after this many seconds without new data "
+        "(default: 0, run until interrupted)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard_spec,
+        default=(1, 1),
+        metavar="I/N",
+        help="Only handle findings whose fingerprint hashes to shard I of N, "
+        "so N CI jobs can file disjoint subsets in parallel",
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="FILE",
+        help="Write a JSONL journal of this run's outcomes (default with "
+        f"--shard: {STATE_DIR}/journal-I-of-N.jsonl)",
+    )
+    parser.add_argument(
+        "--merge-journals",
+        nargs="+",
+        metavar="FILE",
+        help="Combine per-shard journals into one run summary and exit",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help=f"Don't record this run's findings in {HISTORY_PATH}",
+    )
+    parser.add_argument(
+        "--record-history",
+        action="store_true",
+        help="Also record the findings of --plan and --dry-run runs",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="Write the parsed, deduplicated findings to FILE: .parquet or "
+        ".arrow (needs pyarrow, falls back to CSV) or .csv; combine with "
+        "--plan to export without filing",
+    )
+    parser.add_argument(
+        "--trend",
+        action="store_true",
+        help="Show severity and directory trends from the history and exit",
+    )
+    parser.add_argument(
+        "--trend-runs",
+        type=positive_int,
+        default=90,
+        help="Number of recent runs covered by --trend (default: 90)",
+    )
+    parser.add_argument(
+        "--trend-depth",
+        type=positive_int,
+        default=2,
+        help="Directory depth used to group --trend counts (default: 2)",
+    )
+    parser.add_argument(
+        "--older-than",
+        type=float,
+        metavar="DAYS",
+        help="With --trend, list current findings first seen more than DAYS ago",
+    )
+    args = parser.parse_args()
+    if args.write_plan and not args.dry_run:
+        parser.error("--write-plan requires --dry-run")
+    if args.apply and args.dry_run:
+        parser.error("--apply cannot be combined with --dry-run")
+    if args.queue and args.dry_run:
+        parser.error("--queue cannot be combined with --dry-run")
+    if args.export and (args.apply or args.stream or args.watch):
+        parser.error("--export needs a batch run (not --apply, --stream or --watch)")
+    args.reports = expand_reports(args.report)
+    if not args.reports:
+        parser.error("--report matched no files")
+    if len(args.reports) > 1 and Path("-") in args.reports:
+        parser.error("--report - (stdin) cannot be combined with other reports")
+    if args.watch and len(args.reports) > 1:
+        parser.error("--watch follows a single report")
+    if args.watch and str(args.reports[0]) == "-":
+        parser.error("--watch needs a report file, not stdin")
+    if args.watch and is_compressed_report(args.reports[0]):
+        parser.error("--watch needs an uncompressed report")
+    return args
+
+
+def get_app_token_provider(
+    args: argparse.Namespace,
+    repo: Optional[str],
+    timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+) -> AppTokenProvider:
+    """Build the GitHub App token provider from arguments or environment."""
+    if args.app_private_key:
+        try:
+            private_key = Path(args.app_private_key).read_bytes()
+        except OSError as e:
+            print(f"[ERROR] Could not read GitHub App private key: {e}")
+            sys.exit(1)
+    elif os.getenv("GITHUB_APP_PRIVATE_KEY"):
+        private_key = os.environ["GITHUB_APP_PRIVATE_KEY"].encode("utf-8")
+    else:
+        print("[ERROR] --app-id requires --app-private-key or GITHUB_APP_PRIVATE_KEY")
+        sys.exit(1)
+    return AppTokenProvider(
+        args.app_id,
+        private_key,
+        repo,
+        args.app_installation_id,
+        args.api_url,
+        timeout,
+    )
 
 
-def get_token(args: argparse.Namespace) -> str:
+def get_token(args: argparse.Namespace, required: bool = True) -> Optional[str]:
     """Get GitHub token from arguments or environment."""
     token = (
         args.token
         or os.getenv("GITHUB_TOKEN")
         or os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN")
     )
-    if not token and not args.dry_run:
+    if not token and required:
         print("[ERROR] GitHub token required. Set GITHUB_TOKEN env var or use --token")
         sys.exit(1)
     return token
 
 
-def get_repo(args: argparse.Namespace) -> str:
+def get_repo(args: argparse.Namespace, required: bool = True) -> Optional[str]:
     """Get repository from arguments or git."""
     repo = args.repo or get_repo_from_git()
-    if not repo:
+    if not repo and required:
         print("[ERROR] Could not determine repository. Use --repo owner/repo")
         sys.exit(1)
     return repo
 
 
-def parse_and_analyze_findings() -> List[Dict[str, str]]:
-    """Parse report and return findings."""
-    print(f"Reading {REPORT_PATH}...")
-    findings = parse_report()
-    print(f"[OK] Found {len(findings)} findings")
+def load_path_index(args: argparse.Namespace) -> Optional[PathIndex]:
+    """Build the tracked-file index unless disabled."""
+    if args.no_path_index:
+        return None
+    path_index = PathIndex.from_git()
+    if path_index is None:
+        print("[WARNING] git ls-files failed, file paths will not be validated")
+    return path_index
+
+
+def describe_reports(reports: List[Path]) -> str:
+    """Name the reports being read, for progress messages and prompts."""
+    if len(reports) > 1:
+        return f"{len(reports)} reports"
+    return "stdin" if str(reports[0]) == "-" else str(reports[0])
+
+
+def parse_and_analyze_findings(
+    path_index: Optional[PathIndex] = None,
+    reports: Tuple[Path, ...] = (REPORT_PATH,),
+    cache: Optional[SectionCache] = None,
+) -> List[Dict[str, str]]:
+    """Parse one or more reports and return findings."""
+    print(f"Reading {describe_reports(reports)}...")
+    if len(reports) == 1:
+        findings = parse_report(path_index, reports[0], cache)
+        print(f"[OK] Found {len(findings)} findings")
+    else:
+        findings, duplicates = merge_reports(path_index, reports, cache)
+        print(
+            f"[OK] Found {len(findings)} findings "
+            f"({duplicates} duplicates across reports removed)"
+        )
+    if cache:
+        cache.save()
+        print(
+            f"[OK] Parsed {cache.misses} changed sections, "
+            f"{cache.hits} unchanged from {SECTION_CACHE_PATH}"
+        )
     print()
 
     severity_counts = {}
@@ -345,32 +2545,70 @@ def parse_and_analyze_findings() -> List[Dict[str, str]]:
     return findings
 
 
-def confirm_creation(findings: List[Dict[str, str]], dry_run: bool) -> None:
-    """Get user confirmation before creating issues."""
+def assign_owners(owners: OwnerResolver, findings: List[Dict[str, str]]) -> None:
+    """Enrich findings with owners and report how many were assigned."""
+    start = time.monotonic()
+    assigned = owners.enrich(findings)
+    owners.save_cache()
+    elapsed = time.monotonic() - start
+    print(
+        f"[OK] Assigned owners to {assigned}/{len(findings)} findings "
+        f"({elapsed:.1f}s)"
+    )
+    print()
+
+
+def confirm_creation(
+    findings: Optional[List[Dict[str, str]]],
+    dry_run: bool,
+    report: str = str(REPORT_PATH),
+) -> None:
+    """Get user confirmation before creating issues.
+
+    findings is None when streaming, as the count is not known up front.
+    """
     if dry_run:
         print("[DRY-RUN] No issues will be created")
         print()
         return
 
     if sys.stdin.isatty():
-        response = input(f"Create {len(findings)} issues? [y/N]: ")
+        if findings is None:
+            prompt = f"Create issues for all findings in {report}? [y/N]: "
+        else:
+            prompt = f"Create {len(findings)} issues? [y/N]: "
+        response = input(prompt)
         if response.lower() not in ["y", "yes"]:
             print("[CANCELLED] User cancelled operation")
             sys.exit(0)
         print()
 
 
-def create_issues(api: GitHubAPI, findings: List[Dict[str, str]], dry_run: bool) -> tuple[int, int]:
+def create_issues(
+    api: GitHubAPI,
+    findings: List[Dict[str, str]],
+    dry_run: bool,
+    label: str = "",
+    state: Optional[IssueState] = None,
+    journal: Optional[RunJournal] = None,
+    repo: Optional[str] = None,
+    output: Optional[ResultOutput] = None,
+) -> tuple[int, int]:
     """Create GitHub issues and return counts."""
-    print("Creating issues...")
-    print()
-
     created = 0
     failed = 0
 
     for i, finding in enumerate(findings, 1):
-        print(f"[{i}/{len(findings)}] ", end="")
-        if create_issue_for_finding(api, finding, dry_run):
+        prefix = f"[{i}/{len(findings)}] "
+        if label:
+            prefix = f"[{label}] {prefix}"
+        try:
+            ok = create_issue_for_finding(
+                api, finding, dry_run, prefix, state, journal, repo, output
+            )
+        except TimeBudgetExceeded:
+            break
+        if ok:
             created += 1
         else:
             failed += 1
@@ -378,33 +2616,559 @@ def create_issues(api: GitHubAPI, findings: List[Dict[str, str]], dry_run: bool)
     return created, failed
 
 
+def update_filed_issues(
+    router: "IssueRouter", filed: List[Tuple[str, Dict, Dict]], dry_run: bool
+) -> Tuple[int, int, int]:
+    """PATCH filed issues whose rendered content no longer matches GitHub.
+
+    Only issues whose content hash differs from the one recorded in the
+    state are sent, so an unchanged report costs no writes. Entries without
+    a hash (filed before hashes were recorded) are updated once.
+
+    Triage edits are kept: only the labels in router.managed_labels are
+    added or removed, ticked task boxes stay ticked, and the body is left
+    alone unless it is still the one last sent (body_hash in the state).
+    Returns (updated, failed, left), left being the changed issues not
+    reached before the time budget ran out.
+    """
+    changed = []
+    for repo, finding, entry in filed:
+        record = render_issue(finding, repo)
+        if entry.get("hash") != record["content_hash"]:
+            changed.append((record, entry))
+    print(f"[UPDATE] {len(changed)} of {len(filed)} filed issues changed")
+
+    output = router.output
+    managed = router.managed_labels
+    updated = failed = left = 0
+    for position, (record, entry) in enumerate(changed):
+        number = entry["number"]
+        if dry_run:
+            output.line(f"[DRY-RUN] Would update #{number}: {record['title']}")
+            output.result(record["repo"], record, "dry-run-update", number)
+            updated += 1
+            continue
+        api = router.client(record["repo"])
+        try:
+            try:
+                current = api.get_issue(number)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"[ERROR] Could not read issue #{number}: {e}")
+                current = None
+            result = None
+            if current is not None:
+                current_body = current.get("body") or ""
+                current_labels = [label["name"] for label in current.get("labels", [])]
+                labels = [label for label in current_labels if label not in managed]
+                labels += [label for label in record["labels"] if label not in labels]
+                fields = {"title": record["title"], "labels": labels}
+                sent_body = entry.get("body")
+                current_hash = body_hash(current_body)
+                if current_hash == body_hash(record["body"]):
+                    sent_body = current_hash
+                elif sent_body and current_hash == sent_body:
+                    fields["body"] = carry_ticked_tasks(current_body, record["body"])
+                    sent_body = body_hash(record["body"])
+                else:
+                    print(f"[WARNING] Body of #{number} was edited on GitHub, kept")
+                result = api.update_issue(number, fields)
+        except TimeBudgetExceeded:
+            left = len(changed) - position
+            break
+        if result:
+            output.line(f"[OK] Updated issue #{number}: {record['title']}")
+            router.state.record(
+                record["repo"],
+                record["fingerprint"],
+                number,
+                record["content_hash"],
+                sent_body,
+            )
+            if router.journal:
+                router.journal.record(record["repo"], record, "updated", number)
+            output.result(record["repo"], record, "updated", number)
+            updated += 1
+        else:
+            output.line(f"[ERROR] Update failed: #{number}")
+            output.result(record["repo"], record, "update-failed", number)
+            failed += 1
+    router.state.save()
+    if changed and output.verbose:
+        print()
+    return updated, failed, left
+
+
+def create_issues_fanout(
+    router: IssueRouter, grouped: Dict[str, List[Dict[str, str]]], dry_run: bool
+) -> Dict[str, Tuple[int, int]]:
+    """Upload each repository's findings concurrently and return per-repo counts.
+
+    Every repository is drained by its own worker, paced by its own budget.
+    """
+    print("Creating issues...")
+    print()
+
+    try:
+        if len(grouped) <= 1:
+            return {
+                repo: create_issues(
+                    router.api(repo),
+                    findings,
+                    dry_run,
+                    state=router.state,
+                    journal=router.journal,
+                    repo=repo,
+                    output=router.output,
+                )
+                for repo, findings in grouped.items()
+            }
+
+        with ThreadPoolExecutor(max_workers=len(grouped)) as executor:
+            futures = {
+                repo: executor.submit(
+                    create_issues,
+                    router.api(repo),
+                    findings,
+                    dry_run,
+                    repo,
+                    router.state,
+                    router.journal,
+                    repo,
+                    router.output,
+                )
+                for repo, findings in grouped.items()
+            }
+            return {repo: future.result() for repo, future in futures.items()}
+    finally:
+        router.state.save()
+
+
+def simulate_upload(
+    calls: Dict[str, int],
+    workers: int,
+    latency: float,
+    rate_limit: float,
+    hourly_quota: int,
+    burst: int = 5,
+) -> float:
+    """Estimate the wall time in seconds to send calls[repo] requests per repo.
+
+    Discrete-event simulation of workers sending requests of fixed latency,
+    round-robin across repositories, each repository paced by a RateBudget
+    of rate_limit per minute and all of them sharing one primary hourly
+    quota (a token's quota covers every repository it writes to).
+    """
+    interval = 60.0 / rate_limit if rate_limit else 0.0
+    free = [0.0] * max(1, workers)
+    budgets = {repo: (float(burst), 0.0) for repo in calls}
+    pending = dict(calls)
+    window_start, used, end = 0.0, 0, 0.0
+
+    while pending:
+        for repo in list(pending):
+            start = heapq.heappop(free)
+            if interval:
+                tokens, updated = budgets[repo]
+                start = max(start, updated)
+                tokens = min(burst, tokens + (start - updated) / interval)
+                if tokens < 1:
+                    start += (1 - tokens) * interval
+                    tokens = 1.0
+                budgets[repo] = (tokens - 1, start)
+            if hourly_quota:
+                if used >= hourly_quota:
+                    window_start += 3600
+                    used = 0
+                start = max(start, window_start)
+                used += 1
+            finish = start + latency
+            end = max(end, finish)
+            heapq.heappush(free, finish)
+            pending[repo] -= 1
+            if not pending[repo]:
+                del pending[repo]
+    return end
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as e.g. 1h 02m 03s."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m {secs:02d}s"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
+
+
+def print_plan(
+    args: argparse.Namespace,
+    parsed: int,
+    grouped: Dict[str, List[Dict[str, str]]],
+    unrouted: int,
+    skipped: Dict[str, int],
+) -> None:
+    """Print the offline estimate of API calls, quota use and wall time."""
+    calls = {repo: len(findings) for repo, findings in grouped.items()}
+    rest_calls = sum(calls.values())
+    workers = args.workers if args.stream else len(calls)
+    wall_time = simulate_upload(
+        calls, workers, args.plan_latency, args.rate_limit, args.plan_hourly_quota
+    )
+
+    print("=" * 80)
+    print("Run plan (offline estimate, no requests sent)")
+    print("=" * 80)
+    print(f"   Parsed findings:      {parsed}")
+    print(f"   Duplicates in report: {skipped['duplicate']}")
+    print(f"   Already filed:        {skipped['filed']}")
+    if skipped["shard"]:
+        index, count = args.shard
+        print(f"   Other shards:         {skipped['shard']} (this is {index}/{count})")
+    if unrouted:
+        print(f"   Unrouted:             {unrouted}")
+    print(f"   Issues to create:     {rest_calls}")
+    for repo, count in sorted(calls.items()):
+        print(f"      {repo}: {count}")
+    print()
+    print(f"   REST calls:           {rest_calls} (POST /repos/{{repo}}/issues)")
+    print("   GraphQL calls:        0")
+    if args.plan_hourly_quota:
+        share = 100.0 * rest_calls / args.plan_hourly_quota
+        print(
+            f"   Primary quota:        {rest_calls} of "
+            f"{args.plan_hourly_quota}/hour ({share:.0f}%)"
+        )
+        if rest_calls > args.plan_hourly_quota:
+            print("   [WARNING] Run exceeds the hourly quota and will wait for resets")
+    pacing = f"{args.rate_limit:g}/min per repo" if args.rate_limit else "unpaced"
+    print(
+        f"   Assumptions:          {args.plan_latency:g}s per request, "
+        f"{workers} concurrent, {pacing}"
+    )
+    print(f"   Estimated wall time:  {format_duration(wall_time)}")
+    print("=" * 80)
+
+
+def print_trend(args: argparse.Namespace) -> None:
+    """Print history trends answered from the indexed history database."""
+    if not HISTORY_PATH.exists():
+        print(f"[WARNING] No history yet ({HISTORY_PATH} not found)")
+        return
+    history = HistoryStore()
+    start = time.perf_counter()
+    trend = history.severity_trend(args.trend_runs)
+    directories = history.directory_totals(args.trend_runs, args.trend_depth)
+    old = history.older_than(args.older_than) if args.older_than is not None else []
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"Severity by run (last {len(trend)} runs):")
+    print(f"   {'run':>6}  {'date':<16} {'CRIT':>6} {'HIGH':>6} {'MED':>6} {'LOW':>6}")
+    for run_id, started, counts in trend:
+        date = datetime.fromtimestamp(started).strftime("%Y-%m-%d %H:%M")
+        columns = " ".join(f"{counts.get(sev, 0):>6}" for sev in SEVERITY_PRIORITY)
+        print(f"   {run_id:>6}  {date:<16} {columns}")
+    print()
+
+    print(f"Findings by directory (depth {args.trend_depth}, summed over runs):")
+    ranked = sorted(directories.items(), key=lambda item: -sum(item[1].values()))
+    for directory, counts in ranked[:20]:
+        detail = ", ".join(
+            f"{sev.upper()}: {counts[sev]}"
+            for sev in SEVERITY_PRIORITY
+            if sev in counts
+        )
+        print(f"   {directory}: {sum(counts.values())} ({detail})")
+    print()
+
+    if args.older_than is not None:
+        print(f"Current findings first seen more than {args.older_than:g} days ago:")
+        for severity, file_path, line, first_seen in old:
+            seen = datetime.fromtimestamp(first_seen).strftime("%Y-%m-%d")
+            print(f"   [{severity.upper()}] {file_path}:{line} (since {seen})")
+        if not old:
+            print("   (none)")
+        print()
+    print(f"[OK] Queried history in {elapsed:.1f} ms")
+
+
+def record_history(args: argparse.Namespace, findings: List[Dict[str, str]]) -> None:
+    """Add this run's findings to the history database unless disabled.
+
+    --plan and --dry-run runs are only recorded with --record-history. Every
+    --shard parses the same reports, so only shard 1 records them.
+    """
+    if args.no_history or not findings:
+        return
+    if (args.plan or args.dry_run) and not args.record_history:
+        return
+    if args.shard[0] != 1:
+        return
+    run_id = HistoryStore().record_run(findings)
+    print(f"[OK] Recorded run {run_id} in {HISTORY_PATH}")
+    print()
+
+
+def export_report(
+    args: argparse.Namespace,
+    findings: List[Dict[str, str]],
+    owners: Optional[OwnerResolver] = None,
+) -> None:
+    """Write the parsed findings to --export, if requested.
+
+    With --assign-owners the owners of all findings are resolved first, so
+    the export's owner column is filled in.
+    """
+    if not args.export:
+        return
+    if owners:
+        assign_owners(owners, findings)
+    path, count = export_findings(Path(args.export), findings)
+    print(f"[OK] Exported {count} findings to {path}")
+    print()
+
+
+def finish_run(
+    router: IssueRouter,
+    results: Dict[str, Tuple[int, int]],
+    left: Optional[int],
+    metrics_path: Optional[str] = None,
+) -> None:
+    """Report the time budget and concurrency, write metrics, close the journal."""
+    stopped = "time-budget" if router.deadline.expired() else None
+    if stopped:
+        remaining = "an unknown number of" if left is None else str(left)
+        print(
+            f"[TIME BUDGET] Stopped after {router.deadline.seconds:g}s, "
+            f"{remaining} findings left for the next run"
+        )
+    concurrency = router.controller.snapshot() if router.controller else None
+    if concurrency and concurrency["responses"]:
+        print(
+            f"Concurrency: converged to {concurrency['limit']:g} in flight "
+            f"(mean {concurrency['mean_limit']:g}, peak {concurrency['peak_limit']:g}"
+            f" of {concurrency['ceiling']}), {concurrency['cuts']} cuts, "
+            f"{concurrency['throughput_per_s']:g} requests/s"
+        )
+    if metrics_path:
+        metrics = {
+            "duration_s": round(time.monotonic() - router.deadline.started, 3),
+            "created": sum(c for c, _ in results.values()),
+            "failed": sum(f for _, f in results.values()),
+            "left": left if stopped else 0,
+            "stopped": stopped,
+            **router.read_stats(),
+            "concurrency": concurrency,
+        }
+        with open(metrics_path, "w", encoding="utf-8") as f:
+            json.dump(metrics, f, indent=2)
+            f.write("\n")
+        print(f"[OK] Wrote run metrics to {metrics_path}")
+    if router.journal:
+        router.journal.finish(left if stopped else 0, stopped)
+
+
+def print_summary(results: Dict[str, Tuple[int, int]], unrouted: int = 0) -> None:
+    """Print the final created/failed counts, per repository when fanning out."""
+    created = sum(c for c, _ in results.values())
+    failed = sum(f for _, f in results.values())
+    print()
+    print("=" * 80)
+    if len(results) > 1:
+        for repo, (repo_created, repo_failed) in sorted(results.items()):
+            print(f"   {repo}: {repo_created} created, {repo_failed} failed")
+        print()
+    print(f"[OK] Created: {created}")
+    if failed > 0:
+        print(f"[ERROR] Failed: {failed}")
+    if unrouted > 0:
+        print(f"[WARNING] Skipped (no repository route): {unrouted}")
+    print("=" * 80)
+
+
 def main():
     """Main execution function."""
     args = setup_arguments()
+    deadline = Deadline(args.time_budget)
+    output = ResultOutput(args.output, args.quiet)
+    atexit.register(output.close)
+    if args.output == "jsonl":
+        # stdout carries only the JSONL records; everything else goes to stderr
+        sys.stdout = sys.stderr
 
     print("=" * 80)
     print("Security Issue Creator (Direct API)")
     print("=" * 80)
     print()
 
-    token = get_token(args)
-    repo = get_repo(args)
-    print(f"Repository: {repo}")
+    if args.merge_journals:
+        print_summary(merge_journals(args.merge_journals))
+        return
+
+    if args.trend:
+        print_trend(args)
+        return
+
+    routes = load_repo_routes(args)
+    rules = load_rules(args.rules) if args.rules else None
+    rule_repos = rules.repos if rules else []
+    if args.rate_limit is None and (routes or rule_repos):
+        args.rate_limit = FANOUT_RATE_LIMIT
+    repo = get_repo(args, required=not (routes or rule_repos or args.apply))
+    if not is_allowed_api_url(args.api_url):
+        print(f"[ERROR] Invalid API URL. Only HTTPS is allowed: {args.api_url}")
+        sys.exit(1)
+    if args.app_id:
+        token = get_app_token_provider(
+            args, repo, (args.connect_timeout, args.read_timeout)
+        )
+        print(f"Authentication: GitHub App {args.app_id}")
+    else:
+        token = get_token(args, required=not (args.dry_run or args.plan))
+    controller = None
+    if not args.fixed_concurrency:
+        controller = ConcurrencyController(args.workers)
+    router = IssueRouter(
+        routes,
+        repo,
+        token,
+        args.dry_run,
+        args.rate_limit,
+        api_url=args.api_url,
+        shard=args.shard,
+        timeout=(args.connect_timeout, args.read_timeout),
+        deadline=deadline,
+        controller=controller,
+        rules=rules,
+        output=output,
+    )
+    if rules:
+        print(f"Rules: {len(rules.rules)} from {args.rules}")
+    if routes or rule_repos:
+        for prefix, target in router.routes:
+            print(f"Route: {prefix or '(all)'} -> {target}")
+        print(f"Default repository: {repo or '(none)'}")
+    else:
+        print(f"Repository: {repo}")
+    index, count = args.shard
+    if count > 1:
+        print(f"Shard: {index}/{count}")
     print()
 
-    findings = parse_and_analyze_findings()
-    confirm_creation(findings, args.dry_run)
+    journal_path = args.journal
+    if count > 1 and not journal_path:
+        journal_path = STATE_DIR / f"journal-{index}-of-{count}.jsonl"
+    if journal_path and not (args.plan or args.write_plan):
+        router.journal = RunJournal(Path(journal_path), args.shard, args.dry_run)
+        print(f"Journal: {journal_path}")
+        print()
 
-    if findings:
-        api = GitHubAPI(token, repo) if not args.dry_run else None
-        created, failed = create_issues(api, findings, args.dry_run)
+    if args.sync:
+        if token:
+            sync_repositories(router)
+        else:
+            print("[WARNING] --sync needs a GitHub token, skipping")
+            print()
+
+    if args.update and (args.apply or args.watch or args.stream):
+        print("[WARNING] --update only applies to batch runs, ignoring")
+        print()
+
+    if args.apply:
+        results, left = apply_plan(router, args.apply)
+        router.output.close()
+        print_summary(results)
+        finish_run(router, results, left, args.metrics)
+        return
 
+    owners = OwnerResolver() if args.assign_owners else None
+    path_index = load_path_index(args)
+    snippets = None
+    if args.context_lines > 0:
+        tracked = path_index.paths if path_index else None
+        snippets = SourceSnippets(args.context_lines, tracked=tracked)
+    section_cache = None if args.no_section_cache else SectionCache()
+
+    if args.plan:
+        findings = parse_and_analyze_findings(path_index, args.reports, section_cache)
+        record_history(args, findings)
+        export_report(args, findings, owners)
+        grouped, unrouted, skipped = router.partition(findings)
+        print_plan(args, len(findings), grouped, len(unrouted), skipped)
+        return
+
+    if args.watch:
+        results = run_watch(router, args, owners, snippets, path_index)
+        router.output.close()
+        print_summary(results)
+        finish_run(router, results, None, args.metrics)
+        return
+
+    if args.stream:
+        confirm_creation(None, args.dry_run, describe_reports(args.reports))
+        results, unrouted = run_pipeline(router, args, owners, snippets, path_index)
+        router.output.close()
+        print_summary(results, unrouted)
+        finish_run(router, results, None, args.metrics)
+        return
+
+    findings = parse_and_analyze_findings(path_index, args.reports, section_cache)
+    record_history(args, findings)
+    export_report(args, findings, owners)
+    grouped, unrouted, skipped = router.partition(findings)
+
+    if unrouted:
+        print(f"[WARNING] {len(unrouted)} findings match no repository route")
+    if skipped["duplicate"] or skipped["filed"]:
+        print(
+            f"[SKIPPED] {skipped['duplicate']} duplicates, "
+            f"{skipped['filed']} already filed"
+        )
+    if skipped["shard"]:
+        print(f"[SKIPPED] {skipped['shard']} findings belong to other shards")
+    if unrouted or any(skipped.values()):
         print()
-        print("=" * 80)
-        print(f"[OK] Created: {created}")
-        if failed > 0:
-            print(f"[ERROR] Failed: {failed}")
-        print("=" * 80)
+
+    updated = None
+    if args.update and not args.write_plan:
+        filed = router.filed(findings)
+        if snippets:
+            snippets.attach([finding for _, finding, _ in filed])
+        updated = update_filed_issues(router, filed, args.dry_run)
+
+    findings = [f for repo_findings in grouped.values() for f in repo_findings]
+    if owners and not args.export:
+        # With --export, export_report already assigned every finding's owner
+        assign_owners(owners, findings)
+    if snippets:
+        snippets.attach(findings)
+
+    if args.write_plan:
+        count = write_plan(args.write_plan, router, findings)
+        print(f"[OK] Wrote {count} plan records to {args.write_plan}")
+        print(f"     Apply with: --apply {args.write_plan}")
+        return
+
+    confirm_creation(findings, args.dry_run)
+
+    if findings:
+        if args.queue:
+            results = run_queue(router, grouped, args.workers)
+        else:
+            results = create_issues_fanout(router, grouped, args.dry_run)
+        router.output.close()
+        print_summary(results, len(unrouted))
+        attempted = sum(c + f for c, f in results.values())
+        left = len(findings) - attempted + (updated[2] if updated else 0)
+        finish_run(router, results, left, args.metrics)
+    elif updated and sum(updated):
+        print(f"[OK] No new findings, {updated[0]} updated, {updated[1]} failed")
+        finish_run(router, {}, updated[2], args.metrics)
+    elif skipped["filed"]:
+        print("[OK] No new findings, all already filed")
+    elif skipped["shard"]:
+        print("[OK] No findings for this shard")
     else:
         print("[WARNING] No findings detected")
 
@@ -11,12 +11,13 @@ Usage:
 """
 
 import argparse
+import itertools
 import json
 import os
 import re
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 import requests
 
 # Fix encoding for Windows console
@@ -28,6 +29,8 @@ if sys.platform == "win32":
 
 REPORT_PATH = Path("SECURITY_SCAN_REPORT.md")
 GITHUB_API = "https://api.github.com"
+REQUEST_TIMEOUT = (10, 30)  # (connect, read) seconds
+SEVERITY_KEYWORDS = ["critical", "high", "medium", "low"]
 
 
 class GitHubAPI:
@@ -61,6 +64,7 @@ class GitHubAPI:
                 url,
                 data=json.dumps(data).encode("utf-8"),
                 headers=self.headers,
+                timeout=REQUEST_TIMEOUT,
             )
             response.raise_for_status()
             return response.json()
@@ -107,26 +111,44 @@ def get_labels(severity: str) -> List[str]:
     return labels
 
 
-def parse_report() -> List[Dict[str, str]]:
-    """Parse SECURITY_SCAN_REPORT.md."""
+def iter_findings(
+    severity: Optional[str] = None, stats: Optional[Dict[str, int]] = None
+) -> Iterator[Dict[str, str]]:
+    """Lazily parse SECURITY_SCAN_REPORT.md, yielding matching findings.
+
+    The report is read line by line, so a consumer that stops early (e.g.
+    via itertools.islice) stops the read as well. With a severity filter,
+    lines in a section of another severity are skipped before extraction
+    unless they name a severity themselves. stats["lines"] receives the
+    number of lines read.
+    """
     if not REPORT_PATH.exists():
         print(f"[ERROR] {REPORT_PATH} not found")
         sys.exit(1)
 
-    findings = []
-    with REPORT_PATH.open(encoding="utf-8", errors="ignore") as f:
-        content = f.read()
-
-    lines = content.split("\n")
+    wanted = severity.lower() if severity else None
     current_severity = "MEDIUM"
 
-    for line in lines:
-        current_severity = _update_severity(line, current_severity)
-        finding = _extract_finding_from_line(line, current_severity)
-        if finding:
-            findings.append(finding)
+    with REPORT_PATH.open(encoding="utf-8", errors="ignore") as f:
+        for line_count, line in enumerate(f, 1):
+            if stats is not None:
+                stats["lines"] = line_count
+            line = line.rstrip("\n")
+            current_severity = _update_severity(line, current_severity)
+            if (
+                wanted
+                and current_severity.lower() != wanted
+                and not any(s in line.lower() for s in SEVERITY_KEYWORDS)
+            ):
+                continue
+            finding = _extract_finding_from_line(line, current_severity)
+            if finding and (not wanted or finding["severity"] == wanted):
+                yield finding
+
 
-    return findings
+def parse_report() -> List[Dict[str, str]]:
+    """Parse SECURITY_SCAN_REPORT.md."""
+    return list(iter_findings())
 
 
 def _update_severity(line: str, current_severity: str) -> str:
@@ -190,7 +212,7 @@ def _extract_line_number(line: str) -> str:
 
 def _determine_severity(line: str, current_severity: str) -> str:
     """Determine severity for finding."""
-    if any(s in line.lower() for s in ["critical", "high", "medium", "low"]):
+    if any(s in line.lower() for s in SEVERITY_KEYWORDS):
         return parse_severity(line)
     return current_severity.lower()
 
@@ -323,18 +345,18 @@ def get_repo(args: argparse.Namespace) -> str:
 
 
 def parse_and_filter_findings(args: argparse.Namespace) -> List[Dict[str, str]]:
-    """Parse report and apply filters."""
-    print(f"Reading {REPORT_PATH}...")
-    findings = parse_report()
-    print(f"[OK] Found {len(findings)} total findings")
+    """Parse report and apply filters.
 
-    if args.severity:
-        findings = [
-            f for f in findings if f["severity"].lower() == args.severity.lower()
-        ]
-        print(f"[OK] Filtered to {len(findings)} {args.severity} findings")
-
-    findings = findings[: args.limit]
+    The severity filter and limit are pushed into the parser, so reading
+    stops as soon as enough matching findings have been found.
+    """
+    print(f"Reading {REPORT_PATH}...")
+    stats = {"lines": 0}
+    findings = list(
+        itertools.islice(iter_findings(args.severity, stats), args.limit)
+    )
+    matched = f"{args.severity} findings" if args.severity else "findings"
+    print(f"[OK] Found {len(findings)} {matched} in {stats['lines']} lines")
     print(f"[OK] Creating {len(findings)} issues")
     print()
     return findings
@@ -7,35 +7,92 @@ Requires: gh CLI (GitHub CLI) installed and authenticated (gh auth login)
 
 Usage:
     python3 scripts/parse_create_issues.py [--dry-run]
+    python3 scripts/parse_create_issues.py --dry-run --near-dup-threshold 0.8
+    python3 scripts/parse_create_issues.py --dry-run --write-plan plan.ndjson
+    python3 scripts/parse_create_issues.py --apply plan.ndjson
+    python3 scripts/parse_create_issues.py --output jsonl > results.jsonl
 """
 
+import argparse
+import atexit
+import hashlib
+import json
+import os
 import re
 import subprocess
 import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
-REPORT_PATH = Path("SECURITY_SCAN_REPORT.md")
-
+from security_issues_common import (
+    CATEGORY_KEYWORDS,
+    PLAN_FIELDS,
+    ResultOutput,
+    SourceSnippets,
+    expand_reports,
+    finding_fingerprint,
+    format_snippet,
+    get_labels,
+    iter_plan,
+    load_rules,
+    merge_sorted_runs,
+    sorted_run,
+)
 
-def run_command(cmd: List[str], dry_run: bool = False) -> Tuple[int, str]:
+REPORT_PATH = Path("SECURITY_SCAN_REPORT.md")
+# Seconds before a hung gh invocation is killed
+GH_COMMAND_TIMEOUT = float(os.getenv("GH_COMMAND_TIMEOUT", "120"))
+
+# MinHash/LSH parameters for near-duplicate collapse
+MINHASH_PERMUTATIONS = 64
+SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+def describe_command(cmd: List[str]) -> str:
+    """Render a command for the log, with the --body value shown by size only."""
+    shown = list(cmd)
+    for idx, arg in enumerate(cmd[:-1]):
+        if arg == "--body":
+            shown[idx + 1] = f"<body: {len(cmd[idx + 1])} chars>"
+    return " ".join(shown)
+
+
+def run_command(
+    cmd: List[str],
+    dry_run: bool = False,
+    timeout: float = GH_COMMAND_TIMEOUT,
+    echo: bool = True,
+) -> Tuple[int, str]:
     """Execute command safely without shell and return (returncode, output).
 
     SECURITY: This function does NOT use shell=True to prevent command injection.
-    Commands must be passed as a list of arguments.
+    Commands must be passed as a list of arguments. A command still running
+    after timeout seconds is killed and reported as failed. echo=False skips
+    the line naming the command.
     """
     if dry_run:
-        print(f"[DRY-RUN] Would execute: {' '.join(cmd)}")
+        if echo:
+            print(f"[DRY-RUN] Would execute: {describe_command(cmd)}")
         return 0, ""
 
-    print(f" Executing: {' '.join(cmd)}")
+    if echo:
+        print(f" Executing: {describe_command(cmd)}")
     try:
         # SECURITY FIX: Removed shell=True to prevent command injection
         result = subprocess.run(
-            cmd, shell=False, capture_output=True, text=True, encoding="utf-8"
+            cmd,
+            shell=False,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            timeout=timeout,
         )
         return result.returncode, result.stdout + result.stderr
-    except subprocess.SubprocessError as e:
+    except subprocess.TimeoutExpired:
+        print(f" Error executing command: timed out after {timeout:g}s")
+        return 1, f"timed out after {timeout:g}s"
+    except (OSError, subprocess.SubprocessError) as e:
         print(f" Error executing command: {e}")
         return 1, str(e)
 
@@ -59,27 +116,9 @@ def parse_severity(text: str) -> str:
     return "medium"  # Default
 
 
-def get_labels_for_severity(severity: str) -> str:
-    """Get comma-separated labels for given severity."""
-    base_labels = ["security"]
-
-    if severity == "critical":
-        base_labels.append("security-critical")
-        base_labels.append("priority-p0")
-    elif severity == "high":
-        base_labels.append("security-high")
-        base_labels.append("priority-p1")
-    elif severity == "medium":
-        base_labels.append("security-medium")
-        base_labels.append("priority-p2")
-    else:
-        base_labels.append("security-low")
-        base_labels.append("priority-p3")
-
-    return ",".join(base_labels)
-
-
-def _parse_table_row(row_parts: List[str]) -> Optional[Dict[str, str]]:
+def _parse_table_row(
+    row_parts: List[str], categories: List[str] = CATEGORY_KEYWORDS
+) -> Optional[Dict[str, str]]:
     """Parse a single table row into finding data."""
     if len(row_parts) < 3:
         return None
@@ -93,10 +132,7 @@ def _parse_table_row(row_parts: List[str]) -> Optional[Dict[str, str]]:
 
     # Try to identify columns by content
     severity_col = _find_column_by_content(row_parts, ["critical", "high", "medium", "low"])
-    category_col = _find_column_by_content(row_parts, [
-        "xss", "path traversal", "dos", "insecure", "code style",
-        "complexity", "security"
-    ])
+    category_col = _find_column_by_content(row_parts, categories)
     location_col = _find_location_column(row_parts)
     line_col = _find_line_column(row_parts)
 
@@ -153,21 +189,72 @@ def _create_summary_from_parts(parts: List[str], *exclude_indices: int) -> str:
     return " ".join(remaining) if remaining else "Security finding detected"
 
 
-def parse_report() -> List[Dict[str, str]]:
-    """Parse SECURITY_SCAN_REPORT.md and extract findings."""
-    if not REPORT_PATH.exists():
-        print(f" ERROR: {REPORT_PATH} not found.")
+def _dedup_key(finding: Dict[str, str]) -> Tuple[str, int, str, str]:
+    """Key under which two findings count as exact duplicates.
+
+    Ordered by file, then numeric line, for the k-way merge.
+    """
+    line = finding["line"]
+    number = int(line) if line.isdigit() else -1
+    return (finding["file"], number, line, finding["summary"][:100])
+
+
+def parse_report(
+    near_dup_threshold: Optional[float] = None,
+    reports: Tuple[Path, ...] = (REPORT_PATH,),
+    categories: List[str] = CATEGORY_KEYWORDS,
+) -> List[Dict[str, str]]:
+    """Parse one or more reports and extract findings.
+
+    Reports are parsed and sorted by their dedup key in parallel, and the
+    sorted runs are k-way merged by merge_sorted_runs, which drops exact
+    duplicates by comparing adjacent keys (no set of every key) and
+    restores report order: a single report keeps the order it was written
+    in (critical findings first) and, across reports, the report listed
+    first wins.
+
+    When near_dup_threshold is set, findings that survive the exact-match
+    dedup are additionally collapsed with collapse_near_duplicates().
+    """
+
+    def parse_one(number: int, report: Path) -> List[Tuple]:
+        return sorted_run(number, _parse_one_report(report, categories), _dedup_key)
+
+    if len(reports) == 1:
+        runs = [parse_one(0, reports[0])]
+    else:
+        workers = min(len(reports), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(parse_one, range(len(reports)), reports))
+    unique_findings, _ = merge_sorted_runs(runs)
+
+    if near_dup_threshold is not None:
+        before = len(unique_findings)
+        unique_findings = collapse_near_duplicates(unique_findings, near_dup_threshold)
+        collapsed = before - len(unique_findings)
+        if collapsed:
+            print(f" Collapsed {collapsed} near-duplicate findings")
+
+    return unique_findings
+
+
+def _parse_one_report(
+    report: Path, categories: List[str] = CATEGORY_KEYWORDS
+) -> List[Dict[str, str]]:
+    """Extract the findings of a single report, duplicates included."""
+    if not report.exists():
+        print(f" ERROR: {report} not found.")
         sys.exit(1)
 
     findings = []
 
-    with REPORT_PATH.open(encoding="utf-8") as f:
+    with report.open(encoding="utf-8") as f:
         content = f.read()
 
     lines = content.split("\n")
 
     # First try table parsing
-    table_findings = _parse_table_format(lines)
+    table_findings = _parse_table_format(lines, categories)
     if table_findings:
         findings.extend(table_findings)
 
@@ -177,19 +264,145 @@ def parse_report() -> List[Dict[str, str]]:
         text_findings = _parse_text_format(content)
         findings.extend(text_findings)
 
-    # Remove duplicates
-    unique_findings = []
-    seen = set()
+    return findings
+
+
+def _shingles(text: str, size: int = 3) -> frozenset:
+    """Build word shingles from normalised finding text.
+
+    Digits are dropped so the same rule reported on a neighbouring line
+    produces the same shingle set.
+    """
+    words = re.findall(r"[a-z_]+", text.lower())
+    if len(words) < size:
+        return frozenset([" ".join(words)])
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def _minhash_signature(
+    shingles: frozenset, num_perm: int, cache: Dict[str, array]
+) -> Tuple[int, ...]:
+    """Compute the MinHash signature of a shingle set.
+
+    Each shingle is hashed once with SHAKE-128 into num_perm independent
+    32-bit values (cached, as shingles repeat heavily across findings); the
+    signature is the element-wise minimum, which runs in C via zip/min.
+    """
+    rows = []
+    for shingle in shingles:
+        hashes = cache.get(shingle)
+        if hashes is None:
+            digest = hashlib.shake_128(shingle.encode("utf-8")).digest(4 * num_perm)
+            hashes = array("I", digest)
+            cache[shingle] = hashes
+        rows.append(hashes)
+    return tuple(map(min, zip(*rows)))
+
+
+def _lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) minimising LSH false positives plus false negatives.
+
+    The probability that a pair with similarity s shares a bucket is
+    1 - (1 - s**rows)**bands; false positives are integrated below the
+    threshold and false negatives above it. Missed pairs cannot be recovered
+    later while extra candidates are filtered by the similarity check, so
+    false negatives are weighted more heavily.
+    """
+
+    def area(bands: int, rows: int, low: float, high: float, miss: bool) -> float:
+        steps = 50
+        width = (high - low) / steps
+        total = 0.0
+        for i in range(steps):
+            s = low + (i + 0.5) * width
+            p = 1 - (1 - s ** rows) ** bands
+            total += (1 - p if miss else p) * width
+        return total
+
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        false_positive = area(bands, rows, 0.0, threshold, miss=False)
+        false_negative = area(bands, rows, threshold, 1.0, miss=True)
+        error = 0.25 * false_positive + 0.75 * false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def collapse_near_duplicates(
+    findings: List[Dict[str, str]],
+    threshold: float,
+    num_perm: int = MINHASH_PERMUTATIONS,
+) -> List[Dict[str, str]]:
+    """Collapse near-identical findings to one representative per cluster.
+
+    Findings are only compared within the same file. Candidate pairs come
+    from LSH buckets over MinHash signatures, so the cost stays close to
+    linear in the number of findings; each candidate pair is confirmed
+    against the estimated Jaccard similarity before being merged. The
+    representative is the most severe finding of a cluster (first seen on
+    ties) and the original report order is preserved.
+    """
+    if len(findings) < 2:
+        return findings
+
+    bands, rows = _lsh_bands(threshold, num_perm)
+    cache: Dict[str, array] = {}
+    signature_cache: Dict[frozenset, Tuple[int, ...]] = {}
+    signatures = []
     for finding in findings:
-        key = (finding["file"], finding["line"], finding["summary"][:100])
-        if key not in seen:
-            unique_findings.append(finding)
-            seen.add(key)
+        shingles = _shingles(f"{finding.get('category', '')} {finding['summary']}")
+        signature = signature_cache.get(shingles)
+        if signature is None:
+            signature = _minhash_signature(shingles, num_perm, cache)
+            signature_cache[shingles] = signature
+        signatures.append(signature)
+
+    parent = list(range(len(findings)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def similarity(i: int, j: int) -> float:
+        if signatures[i] is signatures[j]:
+            return 1.0
+        matches = sum(map(int.__eq__, signatures[i], signatures[j]))
+        return matches / num_perm
+
+    for band in range(bands):
+        buckets: Dict[Tuple, int] = {}
+        start = band * rows
+        for idx, signature in enumerate(signatures):
+            key = (findings[idx]["file"], signature[start:start + rows])
+            first = buckets.setdefault(key, idx)
+            if first == idx:
+                continue
+            root_a, root_b = find(first), find(idx)
+            if root_a != root_b and similarity(first, idx) >= threshold:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    representatives: Dict[int, int] = {}
+    for idx, finding in enumerate(findings):
+        root = find(idx)
+        current = representatives.get(root)
+        if current is None or (
+            SEVERITY_RANK.get(finding["severity"], 2)
+            < SEVERITY_RANK.get(findings[current]["severity"], 2)
+        ):
+            representatives[root] = idx
 
-    return unique_findings
+    keep = sorted(representatives.values())
+    return [findings[i] for i in keep]
 
 
-def _parse_table_format(lines: List[str]) -> List[Dict[str, str]]:
+def _parse_table_format(
+    lines: List[str], categories: List[str] = CATEGORY_KEYWORDS
+) -> List[Dict[str, str]]:
     """Parse table format from lines."""
     findings = []
 
@@ -199,7 +412,7 @@ def _parse_table_format(lines: List[str]) -> List[Dict[str, str]]:
             # Remove empty first and last elements
             parts = [p for p in parts if p]
 
-            finding = _parse_table_row(parts)
+            finding = _parse_table_row(parts, categories)
             if finding:
                 findings.append(finding)
 
@@ -271,13 +484,10 @@ def _extract_finding_from_text_line(line: str, current_severity: str) -> Optiona
     return finding
 
 
-def create_github_issue(finding: Dict[str, str], dry_run: bool = False) -> bool:
-    """Create a GitHub issue for a single finding.
-
-    SECURITY: Uses subprocess without shell=True to prevent command injection.
-    """
+def render_issue(finding: Dict[str, str]) -> Dict:
+    """Render a finding into a plan record (everything needed to file it)."""
     severity = finding["severity"].upper()
-    labels = get_labels_for_severity(finding["severity"])
+    labels = finding.get("labels") or get_labels(finding["severity"])
 
     # Create issue title
     title = f"[{severity}] {finding['category']} - {finding['file']}:{finding['line']}"
@@ -294,7 +504,7 @@ def create_github_issue(finding: Dict[str, str], dry_run: bool = False) -> bool:
 
 ### Description
 {finding["summary"]}
-
+{format_snippet(finding)}
 ### Source
 This issue was automatically created from `SECURITY_SCAN_REPORT.md`.
 
@@ -311,21 +521,123 @@ This issue was automatically created from `SECURITY_SCAN_REPORT.md`.
 - Security Policy: [SECURITY.md](../SECURITY.md)
 """
 
+    return {
+        "fingerprint": finding_fingerprint(finding),
+        "title": title,
+        "body": body,
+        "labels": labels,
+        "assignees": finding.get("rule_assignees", []),
+        "milestone": finding.get("milestone"),
+        "repo": finding.get("repo"),
+    }
+
+
+def create_issue_from_record(
+    record: Dict, dry_run: bool = False, output: Optional[ResultOutput] = None
+) -> bool:
+    """Create a GitHub issue from a rendered plan record.
+
+    Result lines and records go to output (plain print if None).
+
+    SECURITY: Uses subprocess without shell=True to prevent command injection.
+    """
+    title = record["title"]
+    labels = ",".join(record["labels"])
+
     # SECURITY FIX: Build command as list to avoid shell injection
     # When using subprocess without shell=True, no escaping is needed
-    cmd = ["gh", "issue", "create", "--title", title, "--body", body, "--label", labels]
-
-    returncode, output = run_command(cmd, dry_run)
+    cmd = [
+        "gh",
+        "issue",
+        "create",
+        "--title",
+        title,
+        "--body",
+        record["body"],
+        "--label",
+        labels,
+    ]
+    if record.get("assignees"):
+        cmd += ["--assignee", ",".join(record["assignees"])]
+    say = output.line if output else print
+    milestone = record.get("milestone")
+    if milestone is not None:
+        if not isinstance(milestone, str):
+            # gh --milestone takes the milestone's title, not its number
+            say(f" Failed to create issue: {title}")
+            say(f"   Error: milestone must be a title, not {milestone!r}")
+            if output:
+                output.result(record.get("repo"), record, "failed")
+            return False
+        cmd += ["--milestone", milestone]
+    if record.get("repo"):
+        cmd += ["--repo", record["repo"]]
+
+    returncode, result = run_command(
+        cmd, dry_run, echo=output.verbose if output else True
+    )
 
     if returncode == 0:
-        print(f" Created issue: {title}")
+        say(f" Created issue: {title}")
+        if output:
+            # gh prints the new issue's URL, ending in its number
+            number = result.strip().rsplit("/", 1)[-1]
+            output.result(
+                record.get("repo"),
+                record,
+                "dry-run" if dry_run else "created",
+                int(number) if number.isdigit() else None,
+            )
         return True
     else:
-        print(f" Failed to create issue: {title}")
-        print(f"   Error: {output}")
+        say(f" Failed to create issue: {title}")
+        say(f"   Error: {result}")
+        if output:
+            output.result(record.get("repo"), record, "failed")
         return False
 
 
+def create_github_issue(
+    finding: Dict[str, str],
+    dry_run: bool = False,
+    output: Optional[ResultOutput] = None,
+) -> bool:
+    """Create a GitHub issue for a single finding."""
+    return create_issue_from_record(render_issue(finding), dry_run, output)
+
+
+def write_plan(path: str, findings: List[Dict[str, str]]) -> int:
+    """Write one NDJSON plan record per finding; return the record count."""
+    with open(path, "w", encoding="utf-8") as f:
+        for finding in findings:
+            record = render_issue(finding)
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+    return len(findings)
+
+
+def apply_plan(path: str, output: Optional[ResultOutput] = None) -> Tuple[int, int]:
+    """Create the issues of a plan file without reparsing the report."""
+    print(f" Applying plan {path}...")
+    print()
+
+    created = 0
+    failed = 0
+
+    for i, record in enumerate(iter_plan(path, PLAN_FIELDS), 1):
+        if record is None:
+            failed += 1
+            continue
+        if not output or output.verbose:
+            print(f"[{i}] ", end="")
+        if create_issue_from_record(record, output=output):
+            created += 1
+        else:
+            failed += 1
+
+    return created, failed
+
+
 def check_github_cli() -> None:
     """Check if GitHub CLI is installed and authenticated."""
     returncode, output = run_command(["gh", "auth", "status"], dry_run=False)
@@ -366,7 +678,11 @@ def get_user_confirmation(findings_count: int, dry_run: bool) -> None:
     print()
 
 
-def create_all_issues(findings: List[Dict[str, str]], dry_run: bool) -> Tuple[int, int]:
+def create_all_issues(
+    findings: List[Dict[str, str]],
+    dry_run: bool,
+    output: Optional[ResultOutput] = None,
+) -> Tuple[int, int]:
     """Create all GitHub issues and return counts."""
     print(f" Creating {len(findings)} issues...")
     print()
@@ -375,8 +691,9 @@ def create_all_issues(findings: List[Dict[str, str]], dry_run: bool) -> Tuple[in
     failed = 0
 
     for i, finding in enumerate(findings, 1):
-        print(f"[{i}/{len(findings)}] ", end="")
-        if create_github_issue(finding, dry_run):
+        if not output or output.verbose:
+            print(f"[{i}/{len(findings)}] ", end="")
+        if create_github_issue(finding, dry_run, output):
             created += 1
         else:
             failed += 1
@@ -384,9 +701,116 @@ def create_all_issues(findings: List[Dict[str, str]], dry_run: bool) -> Tuple[in
     return created, failed
 
 
+def similarity_threshold(value: str) -> float:
+    """argparse type for a similarity threshold in (0, 1]."""
+    threshold = float(value)
+    if not 0 < threshold <= 1:
+        raise argparse.ArgumentTypeError("threshold must be in (0, 1]")
+    return threshold
+
+
+def setup_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Create GitHub issues from security report using gh CLI"
+    )
+    parser.add_argument(
+        "--dry-run", "-n", action="store_true", help="Don't actually create issues"
+    )
+    parser.add_argument(
+        "--report",
+        nargs="+",
+        default=[str(REPORT_PATH)],
+        metavar="REPORT",
+        help="Reports or globs to read, parsed in parallel and merged without "
+        f"duplicates (default: {REPORT_PATH})",
+    )
+    parser.add_argument(
+        "--write-plan",
+        metavar="FILE",
+        help="With --dry-run, write the rendered issues as an NDJSON plan "
+        "for a later --apply",
+    )
+    parser.add_argument(
+        "--apply",
+        metavar="FILE",
+        help="Create the issues in an NDJSON plan file (- for stdin) "
+        "without reading the report",
+    )
+    parser.add_argument(
+        "--output",
+        choices=("text", "jsonl"),
+        default="text",
+        help="text: the gh command and result per finding; jsonl: one compact "
+        "JSON record per finding result on stdout, with the log on stderr "
+        "(default: text)",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Don't print lines per finding; show a progress line on "
+        "terminals and the summary only",
+    )
+    parser.add_argument(
+        "--rules",
+        metavar="FILE",
+        help="JSON rules file mapping path globs, summary regexes and "
+        "severities to labels, assignees, milestone and target repository, "
+        "and listing the category keywords of report tables",
+    )
+    parser.add_argument(
+        "--context-lines",
+        type=int,
+        default=0,
+        help="Lines of source shown around the finding in the issue body, read "
+        "only from files tracked in the repository (default: 0, off)",
+    )
+    parser.add_argument(
+        "--near-dup-threshold",
+        type=similarity_threshold,
+        metavar="SIMILARITY",
+        help="Collapse near-duplicate findings in the same file whose "
+        "estimated Jaccard similarity is at least SIMILARITY (e.g. 0.8)",
+    )
+    args = parser.parse_args()
+    args.reports = expand_reports(args.report)
+    if not args.reports:
+        parser.error("--report matched no files")
+    if args.write_plan and not args.dry_run:
+        parser.error("--write-plan requires --dry-run")
+    if args.apply and args.dry_run:
+        parser.error("--apply cannot be combined with --dry-run")
+    return args
+
+
+def print_results(created: int, failed: int, dry_run: bool) -> None:
+    """Print final counts and next steps."""
+    print()
+    print("=" * 80)
+    print(f" Successfully created: {created}")
+    if failed > 0:
+        print(f" Failed: {failed}")
+    print("=" * 80)
+    print()
+
+    if not dry_run:
+        print("Next steps:")
+        print(
+            '1. Run: bash scripts/link_issues_to_project.sh "Security Findings (classic)"'
+        )
+        print("2. Configure branch protection rules")
+        print("3. Review and triage issues on the project board")
+
+
 def main():
     """Main execution function."""
-    dry_run = "--dry-run" in sys.argv or "-n" in sys.argv
+    args = setup_arguments()
+    dry_run = args.dry_run
+    output = ResultOutput(args.output, args.quiet)
+    atexit.register(output.close)
+    if args.output == "jsonl":
+        # stdout carries only the JSONL records; everything else goes to stderr
+        sys.stdout = sys.stderr
 
     print("=" * 80)
     print(" Security Issue Creator")
@@ -397,13 +821,29 @@ def main():
         print(" Running in DRY-RUN mode (no issues will be created)")
         print()
 
-    # Check GitHub CLI
-    check_github_cli()
-    print()
+    # Check GitHub CLI (not needed when only writing a plan)
+    if not args.write_plan:
+        check_github_cli()
+        print()
+
+    if args.apply:
+        created, failed = apply_plan(args.apply, output)
+        output.close()
+        print_results(created, failed, dry_run)
+        sys.exit(0 if failed == 0 else 1)
 
     # Parse the report
-    print(f" Reading {REPORT_PATH}...")
-    findings = parse_report()
+    names = ", ".join(str(report) for report in args.reports)
+    print(f" Reading {names}...")
+    rules = load_rules(args.rules) if args.rules else None
+    categories = rules.categories if rules else CATEGORY_KEYWORDS
+    findings = parse_report(args.near_dup_threshold, args.reports, categories)
+    if rules:
+        print(f" Rules: {len(rules.rules)} from {args.rules}")
+        for finding in findings:
+            rules.apply(finding)
+    if args.context_lines > 0:
+        SourceSnippets(args.context_lines).attach(findings)
 
     print(f" Found {len(findings)} security findings")
     display_findings_summary(findings)
@@ -415,28 +855,19 @@ def main():
         )
         sys.exit(0)
 
+    if args.write_plan:
+        count = write_plan(args.write_plan, findings)
+        print(f" Wrote {count} plan records to {args.write_plan}")
+        print(f"    Apply with: --apply {args.write_plan}")
+        sys.exit(0)
+
     # Get user confirmation
     get_user_confirmation(len(findings), dry_run)
 
     # Create issues
-    created, failed = create_all_issues(findings, dry_run)
-
-    print()
-    print("=" * 80)
-    print(f" Successfully created: {created}")
-    if failed > 0:
-        print(f" Failed: {failed}")
-    print("=" * 80)
-    print()
-
-    if not dry_run:
-        print("Next steps:")
-        print(
-            '1. Run: bash scripts/link_issues_to_project.sh "Security Findings (classic)"'
-        )
-        print("2. Configure branch protection rules")
-        print("3. Review and triage issues on the project board")
-
+    created, failed = create_all_issues(findings, dry_run, output)
+    output.close()
+    print_results(created, failed, dry_run)
     sys.exit(0 if failed == 0 else 1)
 
 
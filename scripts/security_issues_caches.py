@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+scripts/security_issues_caches.py
+
+On-disk caches of create_security_issues_direct.py: conditional-request
+(ETag) responses of GitHub reads (HTTPCache) and the parsed findings of
+unchanged report sections (SectionCache).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from security_issues_state import STATE_DIR
+
+HTTP_CACHE_DIR = STATE_DIR / "http-cache"
+HTTP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SECTION_CACHE_PATH = STATE_DIR / "section-cache.json"
+SECTION_CACHE_MAX_ENTRIES = 20000
+SECTION_CACHE_VERSION = 2
+
+
+class HTTPCache:
+    """Disk-backed cache of GitHub GET responses, keyed by URL.
+
+    Keeps the ETag/Last-Modified validators and JSON body of each URL so
+    repeated reads can be sent as conditional requests; a 304 reply is
+    served from disk and does not count against the primary rate limit.
+    Bodies are evicted least recently used once their total size exceeds
+    max_bytes. Serving a 304 only marks the entry used in memory; the index
+    is written when a new body is stored and by save() at the end of a run.
+    """
+
+    def __init__(
+        self, directory: Path = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index_path = directory / "index.json"
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with self._index_path.open(encoding="utf-8") as f:
+                self.index: Dict[str, Dict] = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.index = {}
+
+    def _body_path(self, url: str) -> Path:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Return conditional request headers for a cached URL."""
+        entry = self.index.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load(self, url: str) -> Optional[Tuple[Any, Optional[str]]]:
+        """Return the cached (body, next page URL) for url, if present."""
+        with self._lock:
+            entry = self.index.get(url)
+            if not entry:
+                return None
+            try:
+                body = json.loads(self._body_path(url).read_bytes())
+            except (OSError, json.JSONDecodeError):
+                del self.index[url]
+                self._dirty = True
+                return None
+            entry["used"] = time.time()
+            self._dirty = True
+            return body, entry.get("next")
+
+    def store(
+        self, url: str, response: requests.Response, next_url: Optional[str]
+    ) -> None:
+        """Cache a 200 response if it carries validators."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._body_path(url).write_bytes(response.content)
+            self.index[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "next": next_url,
+                "size": len(response.content),
+                "used": time.time(),
+            }
+            self._evict()
+            self._save_index()
+
+    def _evict(self) -> None:
+        total = sum(entry["size"] for entry in self.index.values())
+        for url, entry in sorted(self.index.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["size"]
+            del self.index[url]
+            try:
+                self._body_path(url).unlink()
+            except OSError:
+                pass
+
+    def save(self) -> None:
+        """Write the index if entries were used or dropped since the last write."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _save_index(self) -> None:
+        self._dirty = False
+        tmp = self._index_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(self.index, f, separators=(",", ":"))
+        os.replace(tmp, self._index_path)
+
+
+class SectionCache:
+    """Parsed findings of report sections, keyed by a hash of their input.
+
+    A section runs from one heading line to the next, or SECTION_MAX_LINES
+    lines, whichever comes first. The key covers the section text, the
+    severity carried in from the section before and the path index, which
+    together determine everything the parser extracts, so a cached section
+    gives exactly what reparsing it would. Persisted like the blame cache,
+    keeping the most recently used entries.
+    """
+
+    def __init__(self, path: Path = SECTION_CACHE_PATH):
+        self.path = path
+        self.entries = self._load()
+        self.hits = 0
+        self.misses = 0
+        self._used = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def key(severity: str, index_digest: str, lines: List[str]) -> str:
+        digest = hashlib.sha1(
+            f"{SECTION_CACHE_VERSION}\0{severity}\0{index_digest}\0".encode("utf-8")
+        )
+        for line in lines:
+            digest.update(line.encode("utf-8"))
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._used.add(key)
+            return entry
+
+    def put(self, key: str, entry: Dict) -> None:
+        with self._lock:
+            self.entries[key] = entry
+            self._used.add(key)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache, keeping the most recently used entries.
+
+        Nothing is written when every section came from the cache.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            for key in self._used:
+                self.entries[key] = self.entries.pop(key)
+            entries = list(self.entries.items())[-SECTION_CACHE_MAX_ENTRIES:]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            # dumps() encodes in one C call; dump() writes many small chunks
+            f.write(
+                json.dumps(dict(entries), separators=(",", ":"), ensure_ascii=False)
+            )
+        os.replace(tmp, self.path)
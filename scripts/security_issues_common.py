@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+scripts/security_issues_common.py
+
+Helpers shared by create_security_issues_direct.py and parse_create_issues.py:
+report globbing, finding fingerprints, labelling rules, NDJSON plan reading,
+per-finding result output and the source snippets shown in issue bodies.
+Both scripts must agree on fingerprints and plan records, so these live in
+one place. Standard library only.
+"""
+
+import fnmatch
+import glob
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Source context shown in issue bodies
+SNIPPET_CACHE_FILES = 256
+SNIPPET_MMAP_THRESHOLD = 1 << 20
+SNIPPET_LANGUAGES = {
+    "ts": "ts",
+    "tsx": "tsx",
+    "js": "js",
+    "jsx": "jsx",
+    "py": "python",
+    "yml": "yaml",
+    "yaml": "yaml",
+    "css": "css",
+    "json": "json",
+    "md": "markdown",
+    "sh": "bash",
+    "ps1": "powershell",
+}
+
+# Per-finding result output
+PROGRESS_INTERVAL = 0.25
+OUTPUT_BUFFER = 1 << 16
+
+# Keys every plan record needs to be filed
+PLAN_FIELDS = ("title", "body", "labels", "fingerprint")
+
+# Category column keywords of report tables (replaced by a rules file)
+CATEGORY_KEYWORDS = [
+    "xss",
+    "path traversal",
+    "dos",
+    "insecure",
+    "code style",
+    "complexity",
+    "security",
+]
+
+
+def normalize_path(path: str) -> str:
+    """Normalise a path or prefix for routing and fingerprint comparisons."""
+    path = path.replace("\\", "/").strip("`")
+    while path.startswith("./"):
+        path = path[2:]
+    return path.lstrip("/")
+
+
+def fingerprint_key(finding: Dict[str, str]) -> str:
+    """Return the location key that finding_fingerprint hashes."""
+    location = finding["line"]
+    if not location.isdigit():
+        location = re.sub(r"\d+", "", finding["summary"]).lower()
+    return f"{normalize_path(finding['file'])}\0{location}"
+
+
+def finding_fingerprint(finding: Dict[str, str]) -> str:
+    """Return a stable identity for a finding.
+
+    The fingerprint covers the location only (file and line), not the
+    wording or severity, so a rescan that rephrases or reclassifies a
+    finding still maps to the same issue. Findings without a line number
+    fall back to the summary with digits removed.
+
+    Two different findings reported on the same file and line therefore
+    share one issue: the first one seen is filed and the others are
+    listed in its body (see note_collapse), never filed on their own.
+    """
+    return hashlib.sha1(fingerprint_key(finding).encode("utf-8")).hexdigest()
+
+
+def note_collapse(kept: Dict[str, str], dropped: Dict[str, str]) -> None:
+    """Record that dropped shares kept's fingerprint but says something else.
+
+    Prints a warning for the dropped finding and lists its summary under
+    kept["collapsed"] so the issue filed for kept mentions it.
+    """
+    summary = dropped["summary"]
+    collapsed = kept.setdefault("collapsed", [])
+    if summary == kept["summary"] or summary in collapsed:
+        return
+    collapsed.append(summary)
+    print(
+        f"[WARNING] {dropped['file']}:{dropped['line']}: "
+        f"'{summary[:60]}' shares an issue with '{kept['summary'][:60]}'"
+    )
+
+
+def fingerprint_order(finding: Dict[str, str]) -> Tuple[str, int, str]:
+    """Sort key equal exactly for equal fingerprint_keys, lines numerically."""
+    line = finding["line"]
+    number = int(line) if line.isdigit() else -1
+    return (normalize_path(finding["file"]), number, fingerprint_key(finding))
+
+
+def sorted_run(
+    number: int, findings: List[Dict[str, str]], key: Callable[[Dict], Any]
+) -> List[Tuple]:
+    """Sort one report's findings by key, carrying (report, position)."""
+    return sorted(
+        (key(finding), number, position, finding)
+        for position, finding in enumerate(findings)
+    )
+
+
+def merge_sorted_runs(runs: List[List[Tuple]]) -> Tuple[List[Dict[str, str]], int]:
+    """K-way merge sorted_run()s, dropping duplicates, in report order.
+
+    heapq.merge brings equal keys together, so a duplicate is detected by
+    comparing with the previous key only, without a set of every key. The
+    first of equal keys comes from the earliest report (then position), so
+    the report listed first wins. The survivors are returned ordered by
+    (report, position), i.e. in the order the reports were written, with
+    the number of duplicates dropped. A dropped finding whose summary
+    differs from the survivor's is passed to note_collapse.
+    """
+    survivors = []
+    duplicates = 0
+    previous = None
+    for key, number, position, finding in heapq.merge(*runs):
+        if survivors and key == previous:
+            duplicates += 1
+            note_collapse(survivors[-1][2], finding)
+            continue
+        previous = key
+        survivors.append((number, position, finding))
+    survivors.sort(key=lambda survivor: survivor[:2])
+    return [finding for _, _, finding in survivors], duplicates
+
+
+def expand_reports(patterns: List[str]) -> List[Path]:
+    """Expand --report paths and globs in order, dropping repeats."""
+    reports: List[Path] = []
+    for pattern in patterns:
+        if any(c in pattern for c in "*?["):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                print(f"[WARNING] No reports match {pattern}")
+        else:
+            matches = [pattern]
+        for match in matches:
+            if Path(match) not in reports:
+                reports.append(Path(match))
+    return reports
+
+
+def get_labels(severity: str) -> List[str]:
+    """Get labels for severity."""
+    labels = ["security"]
+
+    if severity == "critical":
+        labels.extend(["security-critical", "priority-p0"])
+    elif severity == "high":
+        labels.extend(["security-high", "priority-p1"])
+    elif severity == "medium":
+        labels.extend(["security-medium", "priority-p2"])
+    else:
+        labels.extend(["security-low", "priority-p3"])
+
+    return labels
+
+
+class RuleSet:
+    """Labelling and routing rules compiled once from a --rules JSON file.
+
+    The file holds an optional "severity_labels" object (severity -> labels,
+    replacing the defaults of get_labels) and a "rules" list. Each rule may
+    select findings by "path" (a glob, or a plain prefix), "summary" (a
+    case-insensitive regex) and "severity" (a list), and sets any of
+    "labels", "assignees", "milestone" (a title) and "repo". An optional
+    "categories" list replaces the CATEGORY_KEYWORDS that
+    parse_create_issues.py looks for in report table rows.
+
+    Rules are indexed in a trie keyed by the literal leading segments of
+    their path, so a finding only visits the rules on its own path, and
+    only those rules' compiled summary regexes are run. Labels of every
+    matching rule are added; assignees, milestone and repo come from the
+    first rule that sets them.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.severity_labels = {
+            severity.lower(): list(labels)
+            for severity, labels in config.get("severity_labels", {}).items()
+        }
+        self.categories = [
+            keyword.lower()
+            for keyword in config.get("categories", CATEGORY_KEYWORDS)
+        ]
+        self.rules = []
+        self.trie: Dict[str, Any] = {"rules": [], "children": {}}
+        for index, rule in enumerate(config.get("rules", [])):
+            summary = rule.get("summary")
+            milestone = rule.get("milestone")
+            if milestone is not None and not isinstance(milestone, str):
+                raise TypeError(
+                    f"milestone must be a milestone title, not {milestone!r}"
+                )
+            compiled = {
+                "summary": re.compile(summary, re.IGNORECASE) if summary else None,
+                "severity": {s.lower() for s in rule.get("severity", [])},
+                "labels": list(rule.get("labels", [])),
+                "assignees": list(rule.get("assignees", [])),
+                "milestone": milestone,
+                "repo": rule.get("repo"),
+            }
+            self.rules.append(compiled)
+            self._index(index, normalize_path(rule.get("path", "")))
+
+    def _index(self, index: int, glob: str) -> None:
+        """Add a rule under the literal segments leading its path glob."""
+        segments = [segment for segment in glob.split("/") if segment]
+        node = self.trie
+        for segment in segments:
+            if any(c in segment for c in "*?["):
+                residual = re.compile(fnmatch.translate("/".join(segments)))
+                node["rules"].append((index, residual))
+                return
+            node = node["children"].setdefault(segment, {"rules": [], "children": {}})
+        node["rules"].append((index, None))
+
+    @property
+    def repos(self) -> List[str]:
+        return sorted({rule["repo"] for rule in self.rules if rule["repo"]})
+
+    @property
+    def labels(self) -> Set[str]:
+        """Every label these rules can set."""
+        labels = {label for rule in self.rules for label in rule["labels"]}
+        for severity_labels in self.severity_labels.values():
+            labels.update(severity_labels)
+        return labels
+
+    def candidates(self, path: str) -> List[int]:
+        """Indexes of the rules whose path selects path, in file order."""
+        found = []
+        node = self.trie
+        segments = iter(path.split("/"))
+        while node:
+            for index, residual in node["rules"]:
+                if residual is None or residual.match(path):
+                    found.append(index)
+            node = node["children"].get(next(segments, None))
+        return sorted(found)
+
+    def apply(self, finding: Dict[str, Any]) -> None:
+        """Set labels, assignees, milestone and repo on a finding."""
+        severity = finding["severity"].lower()
+        labels = list(self.severity_labels.get(severity) or get_labels(severity))
+        assignees: List[str] = []
+        milestone = repo = None
+        for index in self.candidates(normalize_path(finding["file"])):
+            rule = self.rules[index]
+            if rule["severity"] and severity not in rule["severity"]:
+                continue
+            if rule["summary"] and not rule["summary"].search(finding["summary"]):
+                continue
+            labels.extend(label for label in rule["labels"] if label not in labels)
+            assignees = assignees or rule["assignees"]
+            milestone = milestone if milestone is not None else rule["milestone"]
+            repo = repo or rule["repo"]
+        finding["labels"] = labels
+        finding["rule_assignees"] = assignees
+        finding["milestone"] = milestone
+        finding["repo"] = repo
+
+
+def load_rules(path: str) -> RuleSet:
+    """Load and compile a --rules file, exiting on invalid JSON or regexes."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[ERROR] Could not read rules {path}: {e}")
+        sys.exit(1)
+    if not isinstance(config, dict) or not isinstance(config.get("rules", []), list):
+        print('[ERROR] Rules must be a JSON object with a "rules" list')
+        sys.exit(1)
+    if not isinstance(config.get("categories", []), list):
+        print('[ERROR] Rules "categories" must be a list of keywords')
+        sys.exit(1)
+    try:
+        return RuleSet(config)
+    except (re.error, AttributeError, TypeError) as e:
+        print(f"[ERROR] Invalid rule in {path}: {e}")
+        sys.exit(1)
+
+
+def _git_output(args: List[str]) -> Optional[str]:
+    """Run a git command in the working directory; None on failure."""
+    try:
+        return subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def iter_plan(path: str, required: Iterable[str] = ()) -> Iterator[Optional[Dict]]:
+    """Stream plan records from an NDJSON file (or - for stdin).
+
+    A line that is not a JSON object, or lacks one of the required keys, is
+    reported and yielded as None so the caller can count it as failed.
+    """
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"[ERROR] Invalid plan record on line {number}: {e}")
+                yield None
+                continue
+            if not isinstance(record, dict):
+                print(f"[ERROR] Invalid plan record on line {number}: not an object")
+                yield None
+                continue
+            missing = [key for key in required if key not in record]
+            if missing:
+                print(
+                    f"[ERROR] Invalid plan record on line {number}: "
+                    f"missing {', '.join(missing)}"
+                )
+                yield None
+                continue
+            yield record
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+class ResultOutput:
+    """How per-finding results are reported.
+
+    "text" prints one line per finding unless quiet; "jsonl" writes one
+    compact JSON record per result to a buffered stdout instead (everything
+    else goes to stderr). When the per-finding lines are off and stderr is
+    a terminal, a single progress line is redrawn at most every
+    PROGRESS_INTERVAL seconds.
+    """
+
+    def __init__(self, mode: str = "text", quiet: bool = False):
+        self.mode = mode
+        self.verbose = mode == "text" and not quiet
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stream = None
+        if mode == "jsonl":
+            self._stream = open(
+                sys.stdout.fileno(),
+                "w",
+                encoding="utf-8",
+                buffering=OUTPUT_BUFFER,
+                closefd=False,
+            )
+        self._progress = not self.verbose and sys.stderr.isatty()
+        self._started: Optional[float] = None
+        self._drawn = 0.0
+
+    def line(self, text: str) -> None:
+        """Print a per-finding line, unless quiet or writing JSONL."""
+        if self.verbose:
+            print(text)
+
+    def result(
+        self, repo: str, record: Dict, status: str, number: Optional[int] = None
+    ) -> None:
+        """Count one finding's outcome and emit its record or progress."""
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+            if self._stream:
+                entry = {
+                    "repo": repo,
+                    "fingerprint": record["fingerprint"],
+                    "status": status,
+                    "number": number,
+                    "title": record["title"],
+                }
+                self._stream.write(
+                    json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+                    + "\n"
+                )
+            now = time.monotonic()
+            if self._started is None:
+                self._started = now
+            if self._progress and now - self._drawn >= PROGRESS_INTERVAL:
+                self._drawn = now
+                self._draw(now)
+
+    def _draw(self, now: float) -> None:
+        done = sum(self.counts.values())
+        elapsed = now - (self._started or now)
+        rate = done / elapsed if elapsed else 0.0
+        counts = ", ".join(f"{n} {status}" for status, n in sorted(self.counts.items()))
+        sys.stderr.write(f"\r[PROGRESS] {done} done ({counts}), {rate:.1f}/s\x1b[K")
+        sys.stderr.flush()
+
+    def close(self) -> None:
+        """Draw the final progress line and flush the JSONL stream."""
+        with self._lock:
+            if self._progress and self.counts:
+                self._draw(time.monotonic())
+                sys.stderr.write("\n")
+            self._progress = False
+            if self._stream:
+                self._stream.flush()
+
+
+class SourceSnippets:
+    """Serve code context around finding lines, reading each file once.
+
+    Findings are grouped by file; each file is read (or memory-mapped when
+    large) a single time, indexed by line start offsets, and every snippet
+    for that file is sliced from the index. Indexed files are kept in a
+    bounded LRU cache so streaming callers don't reread hot files.
+
+    Report paths are untrusted, so only files inside the repository root
+    are read, and inside a git checkout only files in the git index: an
+    absolute path, "../" or a symlink out of the tree, or an untracked
+    file such as .env never ends up in an issue body. tracked defaults to
+    `git ls-files`; pass the PathIndex paths to avoid listing them twice.
+    """
+
+    def __init__(
+        self,
+        context: int = 3,
+        max_files: int = SNIPPET_CACHE_FILES,
+        tracked: Optional[Iterable[str]] = None,
+    ):
+        self.context = context
+        self.max_files = max_files
+        self._files: OrderedDict = OrderedDict()
+        toplevel = _git_output(["rev-parse", "--show-toplevel"])
+        self.root = os.path.realpath(toplevel.strip() if toplevel else ".")
+        if tracked is None and toplevel:
+            listed = _git_output(["ls-files", "-z", "--full-name"])
+            tracked = listed.split("\0") if listed is not None else None
+        self.tracked: Optional[Set[str]] = (
+            {path for path in tracked if path} if tracked is not None else None
+        )
+
+    def _resolve(self, path: str) -> Optional[str]:
+        """Return the real path of a readable report path, or None."""
+        if not path or "://" in path or os.path.isabs(path) or path[0] in "/\\":
+            return None
+        relative = normalize_path(path)
+        if self.tracked is not None and relative not in self.tracked:
+            return None
+        full = os.path.realpath(os.path.join(self.root, relative))
+        if os.path.commonpath([full, self.root]) != self.root:
+            return None
+        return full
+
+    @staticmethod
+    def _index(full: str) -> Tuple[object, array]:
+        with open(full, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= SNIPPET_MMAP_THRESHOLD:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+        offsets = array("Q", [0])
+        pos = data.find(b"\n")
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = data.find(b"\n", pos + 1)
+        if len(offsets) > 1 and offsets[-1] == len(data):
+            offsets.pop()
+        return data, offsets
+
+    def _load(self, path: str) -> Optional[Tuple[object, array]]:
+        if path in self._files:
+            self._files.move_to_end(path)
+            return self._files[path]
+
+        entry = None
+        full = self._resolve(path)
+        if full is not None:
+            try:
+                entry = self._index(full)
+            except (OSError, ValueError):
+                pass
+
+        self._files[path] = entry
+        if len(self._files) > self.max_files:
+            _, evicted = self._files.popitem(last=False)
+            if evicted and isinstance(evicted[0], mmap.mmap):
+                evicted[0].close()
+        return entry
+
+    def snippet(self, path: str, line: str) -> Optional[str]:
+        """Return numbered source lines around path:line, or None."""
+        if not line.isdigit() or self.context <= 0:
+            return None
+        entry = self._load(path)
+        if entry is None:
+            return None
+        data, offsets = entry
+        target = int(line)
+        if not 1 <= target <= len(offsets):
+            return None
+        first = max(1, target - self.context)
+        last = min(len(offsets), target + self.context)
+        width = len(str(last))
+        rendered = []
+        for number in range(first, last + 1):
+            start = offsets[number - 1]
+            end = offsets[number] if number < len(offsets) else len(data)
+            text = bytes(data[start:end]).decode("utf-8", errors="replace")
+            marker = ">" if number == target else " "
+            rendered.append(f"{marker} {number:>{width}} | {text.rstrip()}")
+        return "\n".join(rendered)
+
+    def attach(self, findings: List[Dict[str, str]]) -> int:
+        """Set finding["snippet"] for every finding with readable source."""
+        by_file: Dict[str, List[Dict[str, str]]] = {}
+        for finding in findings:
+            by_file.setdefault(finding["file"], []).append(finding)
+
+        attached = 0
+        for path, file_findings in by_file.items():
+            for finding in file_findings:
+                snippet = self.snippet(path, finding["line"])
+                if snippet:
+                    finding["snippet"] = snippet
+                    attached += 1
+        return attached
+
+
+def format_snippet(finding: Dict[str, str]) -> str:
+    """Render the finding's code context as a Markdown section."""
+    snippet = finding.get("snippet")
+    if not snippet:
+        return ""
+    language = SNIPPET_LANGUAGES.get(Path(finding["file"]).suffix.lstrip("."), "")
+    longest = max((len(run) for run in re.findall(r"`+", snippet)), default=0)
+    fence = "`" * max(3, longest + 1)
+    return f"\n### Code Context\n{fence}{language}\n{snippet}\n{fence}\n"
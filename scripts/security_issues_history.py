@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+scripts/security_issues_history.py
+
+Scan history and findings export of create_security_issues_direct.py: the
+SQLite store behind --trend (HistoryStore) and the CSV, Parquet and Arrow
+writers behind --export. pyarrow is only needed for the columnar formats.
+"""
+
+import csv
+import itertools
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from security_issues_common import finding_fingerprint, normalize_path
+from security_issues_state import STATE_DIR
+
+HISTORY_PATH = STATE_DIR / "history.db"
+EXPORT_ROW_GROUP = 64 * 1024
+EXPORT_COLUMNS = ("fingerprint", "severity", "file", "line", "summary", "owner")
+
+
+class HistoryStore:
+    """Indexed SQLite history of every parsed report.
+
+    findings holds one row per fingerprint with first/last seen times and
+    runs; run_counts holds per-run counts by severity and directory. Trend
+    queries aggregate run_counts by run_id range and age queries use the
+    (last_run, first_seen) index, so neither scans the full history.
+    """
+
+    def __init__(self, path: Path = HISTORY_PATH):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                started REAL NOT NULL,
+                total INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS findings (
+                fingerprint TEXT PRIMARY KEY,
+                severity TEXT NOT NULL,
+                file TEXT NOT NULL,
+                line TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                first_run INTEGER NOT NULL,
+                last_run INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS findings_age
+                ON findings (last_run, first_seen);
+            CREATE TABLE IF NOT EXISTS run_counts (
+                run_id INTEGER NOT NULL,
+                severity TEXT NOT NULL,
+                directory TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (run_id, severity, directory)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def record_run(self, findings: List[Dict[str, str]]) -> int:
+        """Store one run's findings and return its run id."""
+        now = time.time()
+        latest: Dict[str, Dict[str, str]] = {}
+        for finding in findings:
+            latest[finding_fingerprint(finding)] = finding
+        counts: Dict[Tuple[str, str], int] = {}
+        for finding in latest.values():
+            directory = os.path.dirname(normalize_path(finding["file"]))
+            key = (finding["severity"], directory)
+            counts[key] = counts.get(key, 0) + 1
+
+        with self.db:
+            run_id = self.db.execute(
+                "INSERT INTO runs (started, total) VALUES (?, ?)", (now, len(latest))
+            ).lastrowid
+            self.db.executemany(
+                "INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (fingerprint) DO UPDATE SET "
+                "severity = excluded.severity, file = excluded.file, "
+                "line = excluded.line, last_seen = excluded.last_seen, "
+                "last_run = excluded.last_run",
+                (
+                    (fp, f["severity"], f["file"], f["line"], now, now, run_id, run_id)
+                    for fp, f in latest.items()
+                ),
+            )
+            self.db.executemany(
+                "INSERT INTO run_counts VALUES (?, ?, ?, ?)",
+                ((run_id, sev, d, n) for (sev, d), n in counts.items()),
+            )
+        return run_id
+
+    def _window_start(self, runs: int) -> int:
+        row = self.db.execute(
+            "SELECT MIN(id) FROM (SELECT id FROM runs ORDER BY id DESC LIMIT ?)",
+            (runs,),
+        ).fetchone()
+        return row[0] or 0
+
+    def severity_trend(self, runs: int) -> List[Tuple[int, float, Dict[str, int]]]:
+        """Return (run id, start time, counts by severity) for recent runs."""
+        start = self._window_start(runs)
+        trend: Dict[int, Tuple[float, Dict[str, int]]] = {}
+        for run_id, started in self.db.execute(
+            "SELECT id, started FROM runs WHERE id >= ? ORDER BY id", (start,)
+        ):
+            trend[run_id] = (started, {})
+        for run_id, severity, count in self.db.execute(
+            "SELECT run_id, severity, SUM(count) FROM run_counts "
+            "WHERE run_id >= ? GROUP BY run_id, severity",
+            (start,),
+        ):
+            trend[run_id][1][severity] = count
+        return [(run_id, *values) for run_id, values in trend.items()]
+
+    def directory_totals(self, runs: int, depth: int) -> Dict[str, Dict[str, int]]:
+        """Return finding counts by directory prefix and severity over recent runs."""
+        totals: Dict[str, Dict[str, int]] = {}
+        for directory, severity, count in self.db.execute(
+            "SELECT directory, severity, SUM(count) FROM run_counts "
+            "WHERE run_id >= ? GROUP BY directory, severity",
+            (self._window_start(runs),),
+        ):
+            prefix = "/".join(directory.split("/")[:depth]) or "."
+            by_severity = totals.setdefault(prefix, {})
+            by_severity[severity] = by_severity.get(severity, 0) + count
+        return totals
+
+    def older_than(self, days: float, limit: int = 50) -> List[Tuple]:
+        """Return findings in the latest run first seen more than days ago."""
+        return self.db.execute(
+            "SELECT severity, file, line, first_seen FROM findings "
+            "WHERE last_run = (SELECT MAX(id) FROM runs) AND first_seen < ? "
+            "ORDER BY first_seen LIMIT ?",
+            (time.time() - days * 86400, limit),
+        ).fetchall()
+
+
+def export_rows(findings: Iterable[Dict[str, str]]) -> Iterator[Tuple]:
+    """Yield one EXPORT_COLUMNS row per distinct fingerprint."""
+    seen = set()
+    for finding in findings:
+        fingerprint = finding_fingerprint(finding)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        line = finding["line"]
+        yield (
+            fingerprint,
+            finding["severity"].lower(),
+            finding["file"],
+            int(line) if line.isdigit() else None,
+            finding["summary"],
+            finding.get("owner"),
+        )
+
+
+def _export_arrow(path: Path, rows: Iterator[Tuple]) -> int:
+    """Write rows as Parquet (or an Arrow IPC file for .arrow) in row groups.
+
+    severity, file and owner are dictionary-encoded, and rows are converted
+    EXPORT_ROW_GROUP at a time, so memory stays bounded by one row group
+    (plus the distinct values). Each column's dictionary only grows from one
+    row group to the next, so the .arrow file (Feather v2) stores it once
+    and then only delta batches, which the IPC file format allows where a
+    replacement dictionary would be rejected.
+    """
+    import pyarrow as pa
+
+    text = pa.dictionary(pa.int32(), pa.string())
+    schema = pa.schema(
+        [
+            ("fingerprint", pa.string()),
+            ("severity", text),
+            ("file", text),
+            ("line", pa.int32()),
+            ("summary", pa.string()),
+            ("owner", text),
+        ]
+    )
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(
+            path,
+            schema,
+            use_dictionary=["severity", "file", "owner"],
+            compression="zstd",
+        )
+        write = writer.write_table
+    else:
+        options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        writer = pa.ipc.new_file(str(path), schema, options=options)
+        write = writer.write_table
+
+    dictionaries: Dict[str, Dict[str, int]] = {
+        field.name: {} for field in schema if pa.types.is_dictionary(field.type)
+    }
+
+    def encode(name: str, values: Tuple) -> Any:
+        codes = dictionaries[name]
+        indices = [
+            None if value is None else codes.setdefault(value, len(codes))
+            for value in values
+        ]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, pa.int32()), pa.array(list(codes), pa.string())
+        )
+
+    count = 0
+    with writer:
+        while batch := list(itertools.islice(rows, EXPORT_ROW_GROUP)):
+            columns = list(zip(*batch))
+            arrays = [
+                encode(field.name, values)
+                if pa.types.is_dictionary(field.type)
+                else pa.array(values, field.type)
+                for field, values in zip(schema, columns)
+            ]
+            write(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(batch)
+    return count
+
+
+def _export_csv(path: Path, rows: Iterator[Tuple]) -> int:
+    """Write rows as CSV with an EXPORT_COLUMNS header."""
+    count = 0
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def export_findings(path: Path, findings: Iterable[Dict[str, str]]) -> Tuple[Path, int]:
+    """Export distinct findings to path; return the path written and row count.
+
+    .parquet and .arrow need pyarrow; without it the export falls back to
+    CSV next to the requested path. Any other suffix is written as CSV.
+    """
+    rows = export_rows(findings)
+    if path.suffix in (".parquet", ".arrow"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            csv_path = path.with_suffix(".csv")
+            print(f"[WARNING] {path.suffix} export needs: pip install pyarrow")
+            print(f"[WARNING] Writing CSV to {csv_path} instead")
+            return csv_path, _export_csv(csv_path, rows)
+        return path, _export_arrow(path, rows)
+    return path, _export_csv(path, rows)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+scripts/security_issues_limits.py
+
+Pacing and time limits for the uploads of create_security_issues_direct.py:
+the run's --time-budget (Deadline), the per-repository token bucket behind
+--rate-limit (RateBudget) and the AIMD limit on in-flight issue creations
+(ConcurrencyController). Standard library only.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Smallest socket timeout sent; urllib3 rejects 0
+MIN_TIMEOUT = 0.001
+
+# AIMD concurrency control for issue creation
+AIMD_DECREASE = 0.5
+AIMD_SPIKE_FACTOR = 3.0
+AIMD_LATENCY_ALPHA = 0.2
+AIMD_WARMUP = 5
+
+
+class TimeBudgetExceeded(RuntimeError):
+    """Raised when a request would start after the run's --time-budget."""
+
+
+class Deadline:
+    """Wall-clock budget shared by every worker of a run (--time-budget).
+
+    Without a budget it never expires. Requests cap their connect and read
+    timeouts with cap(), so in-flight work is cut off when the budget runs
+    out.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.expires = self.started + seconds if seconds else None
+
+    def remaining(self) -> float:
+        if self.expires is None:
+            return float("inf")
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def check(self) -> None:
+        """Raise TimeBudgetExceeded once the budget is used up."""
+        if self.expired():
+            raise TimeBudgetExceeded(f"time budget of {self.seconds:g}s exhausted")
+
+    def cap(self, timeout: float) -> float:
+        """Limit a socket timeout to the time left, which must be > 0.
+
+        Raises TimeBudgetExceeded when the budget is used up, since a
+        timeout of 0 would be rejected by urllib3 rather than time out.
+        """
+        self.check()
+        return max(min(timeout, self.remaining()), MIN_TIMEOUT)
+
+
+class RateBudget:
+    """Token-bucket request budget for a single repository.
+
+    Each repository gets its own budget so a busy repository cannot starve
+    the others when uploading to several repositories at once.
+    """
+
+    def __init__(self, per_minute: float, burst: int = 5):
+        self.interval = 60.0 / per_minute
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[Deadline] = None) -> None:
+        """Block until a request may be sent.
+
+        Raises TimeBudgetExceeded instead of waiting past the deadline.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+            self.tokens = min(self.capacity, self.tokens + elapsed / self.interval)
+            self.updated = now
+            wait = max(0.0, (1 - self.tokens) * self.interval)
+            if deadline and wait >= deadline.remaining():
+                raise TimeBudgetExceeded("rate budget wait exceeds the time budget")
+            self.tokens -= 1
+        if wait:
+            time.sleep(wait)
+
+
+class ConcurrencyController:
+    """AIMD limit on in-flight issue creations, shared by all workers.
+
+    Each healthy response raises the limit by 1/limit (about +1 per round
+    of requests, up to ceiling). Loss, i.e. a 429, a 403 secondary rate
+    limit, a server error or a timeout, halves it; at most one cut is
+    applied per smoothed round trip, so the responses of one congested
+    round only count once. A latency spike above AIMD_SPIKE_FACTOR x the
+    smoothed latency holds the limit instead of raising it. Every answered
+    request feeds the smoothed latency, spikes included, so a lasting
+    latency shift becomes the new baseline within a few round trips.
+    """
+
+    def __init__(self, ceiling: int, initial: float = 1.0):
+        self.ceiling = ceiling
+        self.limit = min(float(ceiling), initial)
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.samples = 0
+        self.stats = {
+            "responses": 0,
+            "increases": 0,
+            "cuts": 0,
+            "throttled": 0,
+            "spikes": 0,
+        }
+        self.peak = self.limit
+        self._started = time.monotonic()
+        self._last_cut = 0.0
+        self._limit_area = 0.0
+        self._limit_since = self._started
+        self._cond = threading.Condition()
+
+    def acquire(self, deadline: Optional[Deadline] = None) -> None:
+        """Block until fewer than limit requests are in flight."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                if deadline and deadline.expired():
+                    raise TimeBudgetExceeded("time budget exhausted waiting for a slot")
+                self._cond.wait(min(1.0, deadline.remaining()) if deadline else 1.0)
+            self.in_flight += 1
+
+    def release(self, latency: float, status: Optional[int], throttled: bool) -> None:
+        """Record the outcome of a request and adapt the limit."""
+        with self._cond:
+            self.in_flight -= 1
+            self.stats["responses"] += 1
+            now = time.monotonic()
+            loss = throttled or status is None or status >= 500
+            spike = (
+                not loss
+                and self.samples >= AIMD_WARMUP
+                and latency > AIMD_SPIKE_FACTOR * self.latency
+            )
+            if not loss:
+                if self.latency is None:
+                    self.latency = latency
+                else:
+                    self.latency += AIMD_LATENCY_ALPHA * (latency - self.latency)
+                self.samples += 1
+            if loss:
+                self.stats["throttled"] += throttled
+                if now - self._last_cut >= (self.latency or 1.0):
+                    self._set_limit(max(1.0, self.limit * AIMD_DECREASE), now)
+                    self._last_cut = now
+                    self.stats["cuts"] += 1
+            elif spike:
+                self.stats["spikes"] += 1
+            elif self.limit < self.ceiling:
+                self._set_limit(min(self.ceiling, self.limit + 1 / self.limit), now)
+                self.stats["increases"] += 1
+            self._cond.notify_all()
+
+    def cancel(self) -> None:
+        """Give back a slot whose request was never sent."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def _set_limit(self, limit: float, now: float) -> None:
+        self._limit_area += self.limit * (now - self._limit_since)
+        self._limit_since = now
+        self.limit = limit
+        self.peak = max(self.peak, limit)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Controller state for the run metrics."""
+        with self._cond:
+            now = time.monotonic()
+            elapsed = max(now - self._started, 1e-9)
+            area = self._limit_area + self.limit * (now - self._limit_since)
+            return {
+                "limit": round(self.limit, 2),
+                "mean_limit": round(area / elapsed, 2),
+                "peak_limit": round(self.peak, 2),
+                "ceiling": self.ceiling,
+                "latency_ms": round((self.latency or 0) * 1000, 1),
+                "throughput_per_s": round(self.stats["responses"] / elapsed, 2),
+                **self.stats,
+            }
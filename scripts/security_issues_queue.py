@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+scripts/security_issues_queue.py
+
+Durable SQLite job queue behind create_security_issues_direct.py --queue,
+shared by every worker and invocation on the machine. Standard library only.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from security_issues_state import STATE_DIR
+
+QUEUE_PATH = STATE_DIR / "queue.db"
+QUEUE_LEASE_SECONDS = 600
+QUEUE_MAX_ATTEMPTS = 3
+JOB_STATES = ("done", "pending", "leased", "failed")
+
+
+class JobQueue:
+    """Durable SQLite (WAL mode) queue of issues to file.
+
+    Jobs are unique per (repo, fingerprint), so concurrent invocations
+    enqueueing the same report share one job per finding. Workers claim
+    jobs with a lease inside an IMMEDIATE transaction; a job whose lease
+    expires (its worker died) becomes claimable again. Failed uploads are
+    retried with a growing delay up to QUEUE_MAX_ATTEMPTS times; a job that
+    failed for good is re-armed when a later run enqueues it again.
+    """
+
+    def __init__(self, path: Path = QUEUE_PATH):
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                repo TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                record TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                number INTEGER,
+                error TEXT,
+                UNIQUE (repo, fingerprint)
+            )"""
+        )
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_claim "
+            "ON jobs (state, priority, available_at, id)"
+        )
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread; autocommit with explicit transactions
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def enqueue(self, records: List[Dict], priorities: List[int]) -> int:
+        """Add rendered records; return how many were new or re-armed.
+
+        Jobs already in the queue are left alone, except failed ones, which
+        get a fresh record and attempt count.
+        """
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            before = db.total_changes
+            db.executemany(
+                "INSERT INTO jobs (repo, fingerprint, priority, record) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (repo, fingerprint) DO UPDATE SET "
+                "state = 'pending', attempts = 0, available_at = 0, error = NULL, "
+                "priority = excluded.priority, record = excluded.record "
+                "WHERE jobs.state = 'failed'",
+                (
+                    (r["repo"], r["fingerprint"], p, json.dumps(r, ensure_ascii=False))
+                    for r, p in zip(records, priorities)
+                ),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return db.total_changes - before
+
+    def claim(self, owner: str) -> Optional[Tuple[int, Dict]]:
+        """Lease the most urgent available job, or return None."""
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT id, record FROM jobs WHERE "
+                "(state = 'pending' AND available_at <= ?) "
+                "OR (state = 'leased' AND available_at <= ?) "
+                "ORDER BY priority, id LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row:
+                db.execute(
+                    "UPDATE jobs SET state = 'leased', lease_owner = ?, "
+                    "available_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (owner, now + QUEUE_LEASE_SECONDS, row[0]),
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return (row[0], json.loads(row[1])) if row else None
+
+    def next_available(self) -> Optional[float]:
+        """Return when the earliest backed-off pending job becomes claimable."""
+        row = self._db().execute(
+            "SELECT MIN(available_at) FROM jobs WHERE state = 'pending'"
+        ).fetchone()
+        return row[0]
+
+    def release(self, job_id: int) -> None:
+        """Return a claimed job untouched (its upload was never attempted)."""
+        self._db().execute(
+            "UPDATE jobs SET state = 'pending', lease_owner = NULL, "
+            "available_at = 0, attempts = attempts - 1 WHERE id = ?",
+            (job_id,),
+        )
+
+    def complete(self, job_id: int, number: Optional[int]) -> None:
+        self._db().execute(
+            "UPDATE jobs SET state = 'done', number = ?, lease_owner = NULL "
+            "WHERE id = ?",
+            (number, job_id),
+        )
+
+    def fail(self, job_id: int, error: str) -> bool:
+        """Put a job back with backoff, or mark it failed for good (True)."""
+        db = self._db()
+        db.execute(
+            "UPDATE jobs SET lease_owner = NULL, error = ?, "
+            "state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "available_at = ? + 30 * attempts WHERE id = ?",
+            (error, QUEUE_MAX_ATTEMPTS, time.time(), job_id),
+        )
+        row = db.execute("SELECT state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] == "failed"
+
+    def filed(self) -> Iterator[Tuple[str, str, int]]:
+        """Yield (repo, fingerprint, number) for every filed job."""
+        yield from self._db().execute(
+            "SELECT repo, fingerprint, number FROM jobs "
+            "WHERE state = 'done' AND number IS NOT NULL"
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each state."""
+        rows = self._db().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state")
+        return dict(rows.fetchall())
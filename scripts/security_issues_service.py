@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+scripts/security_issues_service.py
+
+Local ingestion service for security findings. Scanner jobs POST reports or
+individual findings instead of running create_security_issues_direct.py
+themselves; the service spools them to disk, batches them over a short time
+window (deduplicating across uploads) and files them on GitHub with one
+shared rate budget per repository.
+
+Endpoints:
+    POST /reports    SECURITY_SCAN_REPORT.md contents as the request body
+    POST /findings   JSON finding or list of findings
+                     ({"severity", "file", "line", "summary"})
+    GET  /status     Queue and upload counters
+
+Usage:
+    python scripts/security_issues_service.py --repo owner/repo
+    python scripts/security_issues_service.py --port 8787 --batch-window 10
+    curl --data-binary @SECURITY_SCAN_REPORT.md http://127.0.0.1:8787/reports
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import os
+import signal
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from create_security_issues_direct import (
+    FANOUT_RATE_LIMIT,
+    GITHUB_API,
+    SEVERITY_PRIORITY,
+    STATE_DIR,
+    IssueRouter,
+    PathIndex,
+    ReportParser,
+    create_issues_fanout,
+    finding_fingerprint,
+    get_app_token_provider,
+    get_repo,
+    get_token,
+    is_allowed_api_url,
+    load_path_index,
+    load_repo_routes,
+    positive_float,
+    positive_int,
+    print_summary,
+)
+
+SPOOL_PATH = STATE_DIR / "spool.jsonl"
+MAX_BODY_BYTES = 32 * 1024 * 1024
+# Cap of the doubling delay before a finding that failed to upload is retried
+RETRY_MAX_DELAY = 600.0
+HTTP_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class Spool:
+    """Durable queue of findings that have been accepted but not yet filed.
+
+    Accepted findings are appended as JSON lines and fsynced before the
+    upload is acknowledged. After each batch the file is atomically
+    rewritten with only the findings still pending, so a restart replays
+    exactly the unfinished work (findings filed before a crash are then
+    skipped through the local issue state).
+    """
+
+    def __init__(self, path: Path = SPOOL_PATH):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def load(self) -> List[Dict[str, str]]:
+        """Return the findings left over from a previous run."""
+        findings = []
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        findings.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash mid-append
+                        continue
+        except OSError:
+            pass
+        return findings
+
+    def append(self, findings: List[Dict[str, str]]) -> None:
+        """Persist findings before they are acknowledged."""
+        with self.path.open("a", encoding="utf-8") as f:
+            for finding in findings:
+                f.write(json.dumps(finding, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def rewrite(self, findings: List[Dict[str, str]]) -> None:
+        """Replace the spool with the findings still pending."""
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for finding in findings:
+                f.write(json.dumps(finding, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+def validate_finding(data: object) -> Optional[Dict[str, str]]:
+    """Return a normalised finding from a JSON upload, or None if invalid."""
+    if not isinstance(data, dict):
+        return None
+    severity = str(data.get("severity", "medium")).lower()
+    file_path = data.get("file")
+    summary = data.get("summary")
+    if severity not in SEVERITY_PRIORITY or not file_path or not summary:
+        return None
+    return {
+        "severity": severity,
+        "file": str(file_path),
+        "line": str(data.get("line") or "N/A"),
+        "summary": str(summary)[:500],
+    }
+
+
+class IngestService:
+    """Accept findings over HTTP and drain them to GitHub in time windows.
+
+    The first finding after an idle period opens a batch window; when it
+    closes (or batch_max findings are waiting) everything pending is
+    deduplicated through IssueRouter.partition and filed by one worker
+    thread, so all uploads share the router's per-repository budgets.
+
+    Findings whose upload failed (or was cut off by the time budget) stay
+    spooled and are queued again after a delay that doubles per attempt,
+    from batch_window up to RETRY_MAX_DELAY.
+    """
+
+    def __init__(
+        self,
+        router: IssueRouter,
+        spool: Spool,
+        path_index: Optional[PathIndex],
+        batch_window: float,
+        batch_max: int,
+        auth_token: Optional[str] = None,
+    ):
+        self.router = router
+        self.spool = spool
+        self.path_index = path_index
+        self.batch_window = batch_window
+        self.batch_max = batch_max
+        self.auth_token = auth_token
+        self.pending = spool.load()
+        # (due loop time, finding) of failed uploads waiting for a retry
+        self.retry: List[Tuple[float, Dict[str, str]]] = []
+        self.attempts: Dict[str, int] = {}
+        self.totals: Dict[str, Tuple[int, int]] = {}
+        self.stats = {"accepted": 0, "batches": 0, "skipped": 0, "unrouted": 0}
+        self._arrived = asyncio.Event()
+        if self.pending:
+            print(f"[OK] Replaying {len(self.pending)} spooled findings")
+            self._arrived.set()
+
+    def accept(self, findings: List[Dict[str, str]]) -> None:
+        """Spool findings durably and queue them for the next batch."""
+        if not findings:
+            return
+        self.spool.append(findings)
+        self.pending.extend(findings)
+        self.stats["accepted"] += len(findings)
+        self._arrived.set()
+
+    async def drain(self) -> None:
+        """Cut and file batches forever."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.retry and not self.pending:
+                delay = min(due for due, _ in self.retry) - loop.time()
+                try:
+                    await asyncio.wait_for(self._arrived.wait(), max(delay, 0))
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await self._arrived.wait()
+            now = loop.time()
+            self.pending.extend(finding for due, finding in self.retry if due <= now)
+            self.retry = [(due, finding) for due, finding in self.retry if due > now]
+            if not self.pending:
+                self._arrived.clear()
+                continue
+
+            deadline = loop.time() + self.batch_window
+            while len(self.pending) < self.batch_max:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._arrived.clear()
+                try:
+                    await asyncio.wait_for(self._arrived.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = self.pending[: self.batch_max]
+            self.pending = self.pending[self.batch_max :]
+            if not self.pending:
+                self._arrived.clear()
+            try:
+                failed = await asyncio.to_thread(self._file_batch, batch)
+            except Exception as e:
+                # Keep the batch spooled and retry after another window
+                print(f"[ERROR] Batch failed, will retry: {e}")
+                self.pending[:0] = batch
+                self._arrived.set()
+                await asyncio.sleep(self.batch_window)
+                continue
+            self._schedule_retries(failed, loop.time())
+            try:
+                self.spool.rewrite(
+                    self.pending + [finding for _, finding in self.retry]
+                )
+            except OSError as e:
+                # The old spool still holds every unfiled finding
+                print(f"[ERROR] Could not rewrite {self.spool.path}: {e}")
+
+    def _schedule_retries(self, failed: List[Dict[str, str]], now: float) -> None:
+        """Queue failed findings again after their backoff delay."""
+        for finding in failed:
+            fingerprint = finding_fingerprint(finding)
+            attempts = self.attempts.get(fingerprint, 0) + 1
+            self.attempts[fingerprint] = attempts
+            delay = min(self.batch_window * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+            self.retry.append((now + delay, finding))
+        if failed:
+            print(f"[RETRY] {len(failed)} findings failed to upload, kept spooled")
+
+    def _file_batch(self, batch: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """File a batch and return the findings that were not filed."""
+        self.stats["batches"] += 1
+        grouped, unrouted, skipped = self.router.partition(batch)
+        self.stats["unrouted"] += len(unrouted)
+        self.stats["skipped"] += sum(skipped.values())
+        new = sum(len(findings) for findings in grouped.values())
+        print(
+            f"[BATCH {self.stats['batches']}] {len(batch)} findings, {new} new, "
+            f"{sum(skipped.values())} skipped, {len(unrouted)} unrouted"
+        )
+        if not grouped:
+            return []
+        results = create_issues_fanout(self.router, grouped, self.router.dry_run)
+        for repo, (created, failed) in results.items():
+            total_created, total_failed = self.totals.get(repo, (0, 0))
+            self.totals[repo] = (total_created + created, total_failed + failed)
+        if self.router.dry_run:
+            return []
+        unfiled = []
+        for repo, findings in grouped.items():
+            for finding in findings:
+                fingerprint = finding_fingerprint(finding)
+                if self.router.state.get(repo, fingerprint):
+                    self.attempts.pop(fingerprint, None)
+                else:
+                    unfiled.append(finding)
+        return unfiled
+
+    def status(self) -> Dict:
+        return {
+            **self.stats,
+            "pending": len(self.pending),
+            "retrying": len(self.retry),
+            "created": sum(c for c, _ in self.totals.values()),
+            "failed": sum(f for _, f in self.totals.values()),
+        }
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one HTTP/1.1 request per connection."""
+        try:
+            status, payload = await self._dispatch(reader)
+        except (asyncio.IncompleteReadError, ValueError, UnicodeDecodeError) as e:
+            status, payload = 400, {"error": str(e) or "malformed request"}
+        except Exception as e:
+            print(f"[ERROR] Request failed: {e}")
+            status, payload = 500, {"error": "internal error"}
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode("ascii")
+            + body
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    def _parse_report(self, text: str) -> Tuple[List[Dict[str, str]], int]:
+        """Parse an uploaded report; returns the findings and unverified paths."""
+        parser = ReportParser(self.path_index)
+        findings = parser.feed(text) + parser.flush()
+        return findings, parser.unverified_paths
+
+    async def _dispatch(self, reader: asyncio.StreamReader) -> Tuple[int, Dict]:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise ValueError("malformed request line")
+        method, target, _ = request_line
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if self.auth_token:
+            # SECURITY: Constant-time comparison of the shared secret
+            expected = f"Bearer {self.auth_token}"
+            if not hmac.compare_digest(headers.get("authorization", ""), expected):
+                return 401, {"error": "unauthorized"}
+
+        path = target.split("?", 1)[0]
+        if path == "/status":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, self.status()
+        if path not in ("/reports", "/findings"):
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        if "content-length" not in headers:
+            return 411, {"error": "Content-Length required"}
+        length = int(headers["content-length"])
+        if length > MAX_BODY_BYTES:
+            return 413, {"error": f"body exceeds {MAX_BODY_BYTES} bytes"}
+        body = (await reader.readexactly(length)).decode("utf-8", errors="ignore")
+
+        if path == "/reports":
+            findings, unverified = await asyncio.to_thread(self._parse_report, body)
+            self.accept(findings)
+            return 202, {"accepted": len(findings), "unverified_paths": unverified}
+
+        data = json.loads(body)
+        items = data if isinstance(data, list) else [data]
+        findings = [validate_finding(item) for item in items]
+        if None in findings:
+            return 400, {"error": "findings need severity, file and summary"}
+        self.accept(findings)
+        return 202, {"accepted": len(findings)}
+
+
+def setup_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Local HTTP service that batches findings into GitHub issues"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8787, help="Bind port")
+    parser.add_argument(
+        "--auth-token",
+        default=os.getenv("SECURITY_INGEST_TOKEN"),
+        help="Require this bearer token from clients (env: SECURITY_INGEST_TOKEN)",
+    )
+    parser.add_argument(
+        "--batch-window",
+        type=float,
+        default=5.0,
+        help="Seconds to collect findings before filing a batch (default: 5)",
+    )
+    parser.add_argument(
+        "--batch-max",
+        type=positive_int,
+        default=500,
+        help="File a batch early once this many findings wait (default: 500)",
+    )
+    parser.add_argument("--token", help="GitHub Personal Access Token")
+    parser.add_argument(
+        "--app-id",
+        default=os.getenv("GITHUB_APP_ID"),
+        help="Authenticate as this GitHub App instead of a token",
+    )
+    parser.add_argument(
+        "--app-private-key",
+        default=os.getenv("GITHUB_APP_PRIVATE_KEY_PATH"),
+        help="PEM private key file of the GitHub App",
+    )
+    parser.add_argument(
+        "--app-installation-id",
+        default=os.getenv("GITHUB_APP_INSTALLATION_ID"),
+        help="Installation to use; looked up from --repo when omitted",
+    )
+    parser.add_argument("--api-url", default=GITHUB_API, help="GitHub API base URL")
+    parser.add_argument("--repo", help="Default repository (owner/repo)")
+    parser.add_argument(
+        "--repo-map", help="JSON file mapping path prefixes to repositories"
+    )
+    parser.add_argument(
+        "--route",
+        action="append",
+        metavar="PREFIX=OWNER/REPO",
+        help="Route findings under PREFIX to a repository (repeatable)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=positive_float,
+        help="Issue creations per minute per repository "
+        f"(default: {FANOUT_RATE_LIMIT:g} with --route/--repo-map, else unpaced)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Log batches without creating issues"
+    )
+    parser.add_argument(
+        "--no-path-index",
+        action="store_true",
+        help="Don't validate uploaded paths against git ls-files",
+    )
+    return parser.parse_args()
+
+
+async def serve(service: IngestService, host: str, port: int) -> None:
+    """Run the HTTP server and the batch drainer until SIGINT/SIGTERM."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: fall back to KeyboardInterrupt
+            pass
+
+    server = await asyncio.start_server(service.handle, host, port)
+    drainer = asyncio.create_task(service.drain())
+    print(f"Listening on http://{host}:{port} (Ctrl+C to stop)")
+    print()
+    async with server:
+        await stop.wait()
+    drainer.cancel()
+    try:
+        await drainer
+    except asyncio.CancelledError:
+        pass
+
+
+def main():
+    """Main execution function."""
+    args = setup_arguments()
+
+    print("=" * 80)
+    print("Security Issue Ingestion Service")
+    print("=" * 80)
+    print()
+
+    routes = load_repo_routes(args)
+    if args.rate_limit is None and routes:
+        args.rate_limit = FANOUT_RATE_LIMIT
+    repo = get_repo(args, required=not routes)
+    if not is_allowed_api_url(args.api_url):
+        print(f"[ERROR] Invalid API URL. Only HTTPS is allowed: {args.api_url}")
+        sys.exit(1)
+    if args.app_id:
+        token = get_app_token_provider(args, repo)
+    else:
+        token = get_token(args, required=not args.dry_run)
+    router = IssueRouter(
+        routes, repo, token, args.dry_run, args.rate_limit, api_url=args.api_url
+    )
+    print(f"Repositories: {', '.join(router.repos) or '(none)'}")
+    print(f"Batch window: {args.batch_window:g}s, up to {args.batch_max} findings")
+    if args.dry_run:
+        print("[DRY-RUN] No issues will be created")
+    print()
+
+    service = IngestService(
+        router,
+        Spool(),
+        load_path_index(args),
+        args.batch_window,
+        args.batch_max,
+        args.auth_token,
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        router.state.save()
+
+    if service.pending:
+        print(f"[OK] {len(service.pending)} findings remain spooled in {SPOOL_PATH}")
+    print_summary(service.totals, service.stats["unrouted"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+scripts/security_issues_state.py
+
+What create_security_issues_direct.py remembers between runs and shards:
+the issues already filed per repository (IssueState), the per-shard run
+journals and their merge (RunJournal, merge_journals), and the shard a
+fingerprint belongs to. State lives under STATE_DIR. Standard library only.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from security_issues_common import iter_plan
+
+STATE_DIR = Path(".security-issues")
+STATE_PATH = STATE_DIR / "state.json"
+STATE_SAVE_EVERY = 100
+
+
+def shard_of(fingerprint: str, count: int) -> int:
+    """Return the 1-based shard a fingerprint belongs to out of count.
+
+    Depends only on the fingerprint, so every CI node computes the same
+    disjoint partition without coordinating.
+    """
+    return int(fingerprint[:16], 16) % count + 1
+
+
+class IssueState:
+    """Local record of the issues already filed, per repository.
+
+    Stored as JSON in .security-issues/state.json, mapping
+    repo -> fingerprint -> {"number": n, "hash": content_hash, "body": body_hash}.
+    Both hashes are of the content last sent to GitHub: "hash" lets --update
+    skip issues whose rendering did not change, "body" tells whether the
+    body on GitHub was edited since. Issues tracked by --sync have neither.
+    Saved every STATE_SAVE_EVERY records and at the end of a run.
+    """
+
+    def __init__(self, path: Path = STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        try:
+            with path.open(encoding="utf-8") as f:
+                self.issues: Dict[str, Dict[str, Dict]] = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.issues = {}
+
+    def get(self, repo: str, fingerprint: str) -> Optional[Dict]:
+        """Return the stored record for a fingerprint, if any."""
+        return self.issues.get(repo, {}).get(fingerprint)
+
+    def record(
+        self,
+        repo: str,
+        fingerprint: str,
+        number: int,
+        content: Optional[str] = None,
+        body: Optional[str] = None,
+    ) -> None:
+        """Remember that fingerprint was filed as issue number in repo."""
+        entry = {"number": number}
+        if content:
+            entry["hash"] = content
+        if body:
+            entry["body"] = body
+        with self._lock:
+            self.issues.setdefault(repo, {})[fingerprint] = entry
+            self._unsaved += 1
+            if self._unsaved >= STATE_SAVE_EVERY:
+                self._save_locked()
+
+    def save(self) -> None:
+        """Write the state file atomically."""
+        with self._lock:
+            if self._unsaved:
+                self._save_locked()
+
+    def _save_locked(self) -> None:
+        # Keep records another process saved since we loaded the file
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                on_disk = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            on_disk = {}
+        for repo, issues in on_disk.items():
+            for fingerprint, issue in issues.items():
+                self.issues.setdefault(repo, {}).setdefault(fingerprint, issue)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(self.issues, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._unsaved = 0
+
+
+class RunJournal:
+    """Append-only JSONL record of one run's upload outcomes.
+
+    The first line describes the run (shard, start time, dry-run); every
+    following line is one finding with its status ("created", "failed" or
+    "dry-run") and issue number. Lines are flushed as they are written, so
+    the journal of an interrupted run is still usable by --merge-journals.
+    """
+
+    def __init__(self, path: Path, shard: Tuple[int, int], dry_run: bool):
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("w", encoding="utf-8")
+        self._write(
+            {
+                "type": "run",
+                "shard": f"{shard[0]}/{shard[1]}",
+                "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "dry_run": dry_run,
+            }
+        )
+
+    def _write(self, entry: Dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def record(
+        self, repo: str, record: Dict, status: str, number: Optional[int] = None
+    ) -> None:
+        """Append the outcome of filing one plan record."""
+        self._write(
+            {
+                "type": "issue",
+                "repo": repo,
+                "fingerprint": record["fingerprint"],
+                "title": record["title"],
+                "status": status,
+                "number": number,
+            }
+        )
+
+    def finish(self, remaining: Optional[int], stopped: Optional[str]) -> None:
+        """Append the closing line and close the journal.
+
+        The closing line records the findings left over and why the run
+        stopped.
+        """
+        self._write(
+            {
+                "type": "end",
+                "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "remaining": remaining,
+                "stopped": stopped,
+            }
+        )
+        self._file.close()
+
+
+def merge_journals(paths: List[str]) -> Dict[str, Tuple[int, int]]:
+    """Combine per-shard journals into one run summary.
+
+    Prints one line per shard and warns about missing shards, journals
+    from differently sized shardings, and fingerprints filed by more than
+    one shard. Returns per-repository (created, failed) counts; "dry-run"
+    entries are not counted as created but reported on their own.
+    """
+    counts: Dict[str, Tuple[int, int]] = {}
+    shards: Dict[int, str] = {}
+    totals = set()
+    filed_by: Dict[str, str] = {}
+    overlaps = 0
+    remaining = 0
+    stopped = []
+    dry_runs = 0
+
+    print(f"Merging {len(paths)} journals...")
+    print()
+    for path in paths:
+        shard = "?"
+        created = failed = dry_run = 0
+        for entry in iter_plan(path):
+            if entry is None:
+                continue
+            if entry.get("type") == "run":
+                shard = entry["shard"]
+                index, total = (int(part) for part in shard.split("/"))
+                totals.add(total)
+                if index in shards:
+                    print(f"[WARNING] Shard {shard} in both {shards[index]} and {path}")
+                shards[index] = path
+                continue
+            if entry.get("type") == "end":
+                remaining += entry.get("remaining") or 0
+                if entry.get("stopped"):
+                    stopped.append(f"{shard} ({entry['stopped']})")
+                continue
+            if entry["status"] not in ("created", "failed", "dry-run"):
+                continue
+            key = f"{entry['repo']}\0{entry['fingerprint']}"
+            if filed_by.setdefault(key, shard) != shard:
+                overlaps += 1
+            repo_created, repo_failed = counts.get(entry["repo"], (0, 0))
+            if entry["status"] == "dry-run":
+                dry_run += 1
+            elif entry["status"] == "failed":
+                failed += 1
+                counts[entry["repo"]] = (repo_created, repo_failed + 1)
+            else:
+                created += 1
+                counts[entry["repo"]] = (repo_created + 1, repo_failed)
+        line = f"   shard {shard}: {created} created, {failed} failed"
+        if dry_run:
+            line += f", {dry_run} dry-run"
+        print(f"{line} ({path})")
+        dry_runs += dry_run
+
+    if len(totals) > 1:
+        print(f"[WARNING] Journals come from different shard counts: {sorted(totals)}")
+    elif totals:
+        missing = sorted(set(range(1, max(totals) + 1)) - set(shards))
+        if missing:
+            print(f"[WARNING] Missing journals for shards: {missing}")
+    if overlaps:
+        print(f"[WARNING] {overlaps} findings were filed by more than one shard")
+    if stopped:
+        print(f"[WARNING] Stopped early: {', '.join(stopped)}")
+        print(f"[WARNING] {remaining} findings left for the next run")
+    if dry_runs:
+        print(f"[DRY-RUN] {dry_runs} findings would have been created")
+    return counts
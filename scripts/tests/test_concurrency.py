@@ -0,0 +1,106 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import security_issues_limits
+from security_issues_limits import (
+    AIMD_WARMUP,
+    ConcurrencyController,
+    Deadline,
+    TimeBudgetExceeded,
+)
+
+
+class ConcurrencyControllerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        clock = SimpleNamespace(monotonic=lambda: self.now)
+        patcher = mock.patch.object(security_issues_limits, "time", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.controller = ConcurrencyController(ceiling=8)
+
+    def respond(self, latency=0.1, status=201, throttled=False):
+        self.controller.acquire()
+        self.now += latency
+        self.controller.release(latency, status, throttled)
+
+    def test_additive_increase_up_to_ceiling(self):
+        self.respond()
+        self.assertEqual(self.controller.limit, 2.0)
+        self.respond()
+        self.assertEqual(self.controller.limit, 2.5)
+        for _ in range(200):
+            self.respond()
+        self.assertEqual(self.controller.limit, 8)
+
+    def test_loss_halves_once_per_round_trip(self):
+        for _ in range(30):
+            self.respond()
+        limit = self.controller.limit
+        self.respond(status=429, throttled=True)
+        self.assertEqual(self.controller.limit, limit / 2)
+        self.respond(latency=0.01, status=502)
+        self.assertEqual(self.controller.limit, limit / 2)
+        self.now += 1.0
+        self.respond(status=None)
+        self.assertEqual(self.controller.limit, limit / 4)
+        self.assertEqual(self.controller.stats["cuts"], 2)
+        self.assertEqual(self.controller.stats["throttled"], 1)
+
+    def test_limit_never_drops_below_one(self):
+        for _ in range(5):
+            self.now += 10
+            self.respond(status=503)
+        self.assertEqual(self.controller.limit, 1.0)
+
+    def test_latency_spike_holds_the_limit(self):
+        for _ in range(AIMD_WARMUP):
+            self.respond(latency=0.1)
+        limit = self.controller.limit
+        self.respond(latency=1.0)
+        self.assertEqual(self.controller.limit, limit)
+        self.assertEqual(self.controller.stats["spikes"], 1)
+
+    def test_smoothed_latency_follows_a_lasting_shift(self):
+        for _ in range(AIMD_WARMUP):
+            self.respond(latency=0.1)
+        limit = self.controller.limit
+        for _ in range(20):
+            self.respond(latency=1.0)
+        self.assertGreater(self.controller.limit, limit)
+        self.assertAlmostEqual(self.controller.latency, 1.0, delta=0.05)
+
+    def test_acquire_gives_up_at_the_deadline(self):
+        self.controller.acquire()
+        deadline = Deadline(5)
+        self.now += 5
+        with self.assertRaises(TimeBudgetExceeded):
+            self.controller.acquire(deadline)
+
+    def test_cancel_returns_the_slot(self):
+        self.controller.acquire()
+        self.controller.cancel()
+        self.assertEqual(self.controller.in_flight, 0)
+        self.controller.acquire()
+        self.assertEqual(self.controller.in_flight, 1)
+
+
+class DeadlineTest(unittest.TestCase):
+    def test_cap_never_returns_zero(self):
+        with mock.patch.object(security_issues_limits.time, "monotonic") as clock:
+            clock.return_value = 100.0
+            deadline = Deadline(2)
+            self.assertEqual(deadline.cap(30), 2)
+            clock.return_value = 101.9999999
+            self.assertGreater(deadline.cap(30), 0)
+            clock.return_value = 102.0
+            with self.assertRaises(TimeBudgetExceeded):
+                deadline.cap(30)
+
+    def test_unbounded_deadline_keeps_the_timeout(self):
+        self.assertEqual(Deadline().cap(30), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
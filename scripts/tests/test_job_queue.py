@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import security_issues_queue
+from security_issues_queue import (
+    QUEUE_LEASE_SECONDS,
+    QUEUE_MAX_ATTEMPTS,
+    JobQueue,
+)
+
+
+def record(fingerprint, repo="a/b"):
+    return {"repo": repo, "fingerprint": fingerprint, "title": f"Issue {fingerprint}"}
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.now = 1000.0
+        clock = SimpleNamespace(time=lambda: self.now)
+        patcher = mock.patch.object(security_issues_queue, "time", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.queue = JobQueue(Path(directory.name) / "queue.db")
+
+    def test_claims_the_most_urgent_job_first(self):
+        self.queue.enqueue([record("low"), record("critical")], [3, 0])
+        _, claimed = self.queue.claim("w1")
+        self.assertEqual(claimed["fingerprint"], "critical")
+        _, claimed = self.queue.claim("w2")
+        self.assertEqual(claimed["fingerprint"], "low")
+        self.assertIsNone(self.queue.claim("w3"))
+
+    def test_enqueue_keeps_one_job_per_repo_and_fingerprint(self):
+        self.assertEqual(self.queue.enqueue([record("1"), record("2")], [1, 1]), 2)
+        again = [record("1"), record("1", "a/c")]
+        self.assertEqual(self.queue.enqueue(again, [1, 1]), 1)
+        self.assertEqual(self.queue.counts(), {"pending": 3})
+
+    def test_expired_lease_becomes_claimable_again(self):
+        self.queue.enqueue([record("1")], [1])
+        job_id, _ = self.queue.claim("dead worker")
+        self.assertIsNone(self.queue.claim("w2"))
+        self.now += QUEUE_LEASE_SECONDS - 1
+        self.assertIsNone(self.queue.claim("w2"))
+        self.now += 1
+        claimed = self.queue.claim("w2")
+        self.assertEqual(claimed[0], job_id)
+
+    def test_release_returns_the_job_without_an_attempt(self):
+        self.queue.enqueue([record("1")], [1])
+        for _ in range(QUEUE_MAX_ATTEMPTS + 1):
+            job_id, _ = self.queue.claim("w1")
+            self.queue.release(job_id)
+        job_id, _ = self.queue.claim("w1")
+        self.assertFalse(self.queue.fail(job_id, "HTTP 502"))
+
+    def test_failed_jobs_back_off_then_fail_for_good(self):
+        self.queue.enqueue([record("1")], [1])
+        for attempt in range(1, QUEUE_MAX_ATTEMPTS):
+            job_id, _ = self.queue.claim("w1")
+            self.assertFalse(self.queue.fail(job_id, "HTTP 502"))
+            self.assertIsNone(self.queue.claim("w1"))
+            self.assertEqual(self.queue.next_available(), self.now + 30 * attempt)
+            self.now += 30 * attempt
+        job_id, _ = self.queue.claim("w1")
+        self.assertTrue(self.queue.fail(job_id, "HTTP 502"))
+        self.assertEqual(self.queue.counts(), {"failed": 1})
+
+        self.assertEqual(self.queue.enqueue([record("1")], [1]), 1)
+        self.assertEqual(self.queue.counts(), {"pending": 1})
+
+    def test_completed_jobs_are_listed_as_filed(self):
+        self.queue.enqueue([record("1"), record("2")], [1, 1])
+        job_id, _ = self.queue.claim("w1")
+        self.queue.complete(job_id, 42)
+        self.assertEqual(list(self.queue.filed()), [("a/b", "1", 42)])
+        self.assertEqual(self.queue.enqueue([record("1")], [1]), 0)
+        self.assertEqual(self.queue.counts(), {"done": 1, "pending": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
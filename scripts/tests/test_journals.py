@@ -0,0 +1,76 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from security_issues_state import RunJournal, merge_journals
+
+
+def record(fingerprint):
+    return {"fingerprint": fingerprint, "title": f"Issue {fingerprint}"}
+
+
+class MergeJournalsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = Path(directory.name)
+
+    def journal(self, shard, entries, dry_run=False, remaining=0, stopped=None):
+        path = self.dir / f"journal-{shard[0]}-of-{shard[1]}.jsonl"
+        journal = RunJournal(path, shard, dry_run)
+        for repo, fingerprint, status in entries:
+            journal.record(repo, record(fingerprint), status, 1)
+        journal.finish(remaining, stopped)
+        return str(path)
+
+    def merge(self, paths):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            counts = merge_journals(paths)
+        return counts, out.getvalue()
+
+    def test_counts_created_and_failed_per_repository(self):
+        paths = [
+            self.journal((1, 2), [("a/b", "1", "created"), ("a/c", "2", "failed")]),
+            self.journal((2, 2), [("a/b", "3", "created"), ("a/b", "4", "updated")]),
+        ]
+        counts, out = self.merge(paths)
+        self.assertEqual(counts, {"a/b": (2, 0), "a/c": (0, 1)})
+        self.assertIn("shard 1/2: 1 created, 1 failed", out)
+        self.assertNotIn("[WARNING]", out)
+
+    def test_dry_run_entries_are_not_created(self):
+        paths = [
+            self.journal((1, 2), [("a/b", "1", "dry-run")], dry_run=True),
+            self.journal((2, 2), [("a/b", "2", "dry-run")], dry_run=True),
+        ]
+        counts, out = self.merge(paths)
+        self.assertEqual(counts, {})
+        self.assertIn("shard 2/2: 0 created, 0 failed, 1 dry-run", out)
+        self.assertIn("[DRY-RUN] 2 findings would have been created", out)
+
+    def test_warns_about_missing_shards_overlaps_and_early_stops(self):
+        paths = [
+            self.journal((1, 3), [("a/b", "1", "created")]),
+            self.journal(
+                (3, 3), [("a/b", "1", "created")], remaining=4, stopped="time-budget"
+            ),
+        ]
+        _, out = self.merge(paths)
+        self.assertIn("Missing journals for shards: [2]", out)
+        self.assertIn("1 findings were filed by more than one shard", out)
+        self.assertIn("Stopped early: 3/3 (time-budget)", out)
+        self.assertIn("4 findings left for the next run", out)
+
+    def test_skips_malformed_lines(self):
+        path = self.journal((1, 1), [("a/b", "1", "created")])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("{truncated\n")
+        counts, _ = self.merge([path])
+        self.assertEqual(counts, {"a/b": (1, 0)})
+
+
+if __name__ == "__main__":
+    unittest.main()
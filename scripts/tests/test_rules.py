@@ -0,0 +1,70 @@
+import unittest
+
+from security_issues_common import RuleSet, get_labels
+
+
+def finding(file, severity="high", summary="weak JWT secret"):
+    return {"file": file, "line": "1", "severity": severity, "summary": summary}
+
+
+class RuleSetTest(unittest.TestCase):
+    def setUp(self):
+        self.rules = RuleSet(
+            {
+                "rules": [
+                    {"path": "backend", "labels": ["backend"], "repo": "org/api"},
+                    {"path": "backend/src/*.ts", "assignees": ["alice"]},
+                    {"path": "frontend/", "labels": ["frontend"], "milestone": "Q4"},
+                    {"summary": "jwt", "labels": ["auth"], "repo": "org/auth"},
+                    {"path": "**/*.py", "severity": ["critical"], "labels": ["py"]},
+                ]
+            }
+        )
+
+    def test_candidates_prefix_and_glob(self):
+        self.assertEqual(self.rules.candidates("backend/src/server.ts"), [0, 1, 3])
+        self.assertEqual(self.rules.candidates("backend/src/db/pool.js"), [0, 3])
+        self.assertEqual(self.rules.candidates("frontend/app/page.tsx"), [2, 3])
+        self.assertEqual(self.rules.candidates("scripts/run.py"), [3, 4])
+        self.assertEqual(self.rules.candidates("docs/readme.md"), [3])
+
+    def test_candidates_match_whole_segments(self):
+        self.assertEqual(self.rules.candidates("backendish/x.ts"), [3])
+
+    def test_apply_merges_labels_and_takes_first_values(self):
+        item = finding("backend/src/server.ts")
+        self.rules.apply(item)
+        self.assertEqual(item["labels"], get_labels("high") + ["backend", "auth"])
+        self.assertEqual(item["rule_assignees"], ["alice"])
+        self.assertEqual(item["repo"], "org/api")
+        self.assertIsNone(item["milestone"])
+
+    def test_apply_filters_on_summary_and_severity(self):
+        item = finding("scripts/run.py", severity="medium", summary="eval of input")
+        self.rules.apply(item)
+        self.assertEqual(item["labels"], get_labels("medium"))
+        self.assertIsNone(item["repo"])
+
+        item = finding("scripts/run.py", severity="critical", summary="eval")
+        self.rules.apply(item)
+        self.assertIn("py", item["labels"])
+
+    def test_apply_normalizes_the_path(self):
+        item = finding("./frontend\\app\\page.tsx", summary="xss")
+        self.rules.apply(item)
+        self.assertIn("frontend", item["labels"])
+        self.assertEqual(item["milestone"], "Q4")
+
+    def test_severity_labels_replace_defaults(self):
+        rules = RuleSet({"severity_labels": {"High": ["sec", "p1"]}})
+        item = finding("a.py")
+        rules.apply(item)
+        self.assertEqual(item["labels"], ["sec", "p1"])
+
+    def test_numeric_milestone_is_rejected(self):
+        with self.assertRaises(TypeError):
+            RuleSet({"rules": [{"path": "a", "milestone": 3}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from create_security_issues_direct import PathIndex, parse_report
+from security_issues_caches import SectionCache
+
+REPORT = """# Security Scan Report
+
+## Critical Findings
+
+| Severity | Category | File | Line | Description |
+|---|---|---|---|---|
+| Critical | XSS | frontend/src/app/page.tsx | 12 | Unsanitized input |
+| High | Path Traversal | backend/src/server.ts | 40 | User path to readFile |
+
+## High Findings
+
+- backend/src/controllers/auth.controller.ts line 88: weak JWT secret
+- backend/src/services/user.service.ts 10 Missing rate limit
+
+## Medium Findings
+
+- frontend/src/lib/utils.ts 5 Insecure randomness via Math.random
+"""
+
+
+class SectionCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = Path(directory.name)
+        self.report = self.dir / "report.md"
+        self.cache_path = self.dir / "section-cache.json"
+
+    def parse(self, text, cache=None, path_index=None):
+        self.report.write_text(text, encoding="utf-8")
+        with redirect_stdout(io.StringIO()):
+            return parse_report(path_index, self.report, cache)
+
+    def cached_parse(self, text, path_index=None):
+        cache = SectionCache(self.cache_path)
+        findings = self.parse(text, cache, path_index)
+        cache.save()
+        return findings, cache
+
+    def assert_same_as_full_parse(self, text, path_index=None):
+        findings, cache = self.cached_parse(text, path_index)
+        self.assertEqual(findings, self.parse(text, path_index=path_index))
+        return cache
+
+    def test_unchanged_report_is_served_from_the_cache(self):
+        self.cached_parse(REPORT)
+        cache = self.assert_same_as_full_parse(REPORT)
+        self.assertEqual(cache.misses, 0)
+        self.assertGreater(cache.hits, 0)
+
+    def test_edited_section_equals_a_full_parse(self):
+        self.cached_parse(REPORT)
+        edited = REPORT.replace("line 88: weak JWT secret", "line 90: JWT in logs")
+        cache = self.assert_same_as_full_parse(edited)
+        self.assertEqual(cache.misses, 1)
+
+    def test_inserted_section_equals_a_full_parse(self):
+        self.cached_parse(REPORT)
+        edited = REPORT.replace(
+            "## Medium Findings",
+            "## Low Findings\n\n- docs/setup.md 3 Token in example\n\n"
+            "## Medium Findings",
+        )
+        self.assert_same_as_full_parse(edited)
+
+    def test_severity_change_reaches_the_following_sections(self):
+        self.cached_parse(REPORT)
+        edited = REPORT.replace("## High Findings", "## Low Findings")
+        self.assert_same_as_full_parse(edited)
+
+    def test_path_index_change_invalidates_entries(self):
+        self.cached_parse(REPORT)
+        index = PathIndex(["frontend/src/app/page.tsx", "backend/src/server.ts"])
+        cache = self.assert_same_as_full_parse(REPORT, index)
+        self.assertEqual(cache.hits, 0)
+
+    def test_nothing_is_written_when_every_section_hits(self):
+        self.cached_parse(REPORT)
+        written = self.cache_path.stat().st_mtime_ns
+        self.cached_parse(REPORT)
+        self.assertEqual(self.cache_path.stat().st_mtime_ns, written)
+
+
+if __name__ == "__main__":
+    unittest.main()